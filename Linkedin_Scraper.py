@@ -4,24 +4,26 @@
 # =============================================
 
 import asyncio
-import httpx
-from bs4 import BeautifulSoup
-import re
-import random
 import os
-from datetime import datetime, timedelta
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font
-from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib.colors import blue
+import time
+from datetime import datetime
+import document_export
+import excel_export
+import parquet_snapshot
 import tempfile
 import shutil
 import psycopg2
+from db_client import staging_csv
+from export_queue import ExportQueue, shutdown_file_pool, submit_save
+from job_batch import RunDedupe, make_page_filter
+from linkedin_search import DEFAULT_TIME_WINDOW, iter_search_pages, shutdown_parse_pool
+from query_planner import MAX_PAGES, Query, describe, run_plan
+from rate_limiter import limiter_summary
+from response_cache import get_response_cache
+from crawl_state import get_crawl_state
+from seen_index import get_seen_index
+from repost_detector import get_repost_detector
+from http_client import create_client, print_connection_stats
 
 # =============================================
 # CONFIG
@@ -30,6 +32,9 @@ KEYWORDS = ["DevOps Engineer", "Java Backend Developer"]
 LOCATION = "United States"
 MAX_RETRY = 3
 SOURCE_PORTAL = "LinkedIn"
+KEYWORD_CONCURRENCY = 4     # keywords scraped at the same time (1 = serial)
+PAGE_PREFETCH = 3           # page requests kept in flight per keyword
+INCREMENTAL = True          # stop paging once a whole page is behind the keyword's watermark
 
 
 # =============================================
@@ -100,18 +105,70 @@ class DBClient:
             RETURNING job_id;
         """
         values = (
-            job["Title"],
-            job["Company"],
-            job["Location"],
-            job["Date Posted"],
-            job["Keyword"],
-            job["Job Link"],
-            job["Mobile Link"],
+            job.title,
+            job.company,
+            job.location,
+            job.date_posted,
+            job.keyword_label,
+            job.job_link,
+            job.mobile_link,
             source_portal
         )
         self.cur.execute(sql, values)
         return self.cur.fetchone()[0]
 
+    def ingest_master(self, jobs, source_portal):
+        """
+        Whole keyword batch in one go: COPY into a session-local staging
+        table, then one plain INSERT ... SELECT into job_master. Runs in the
+        caller's transaction. Returns the number of rows inserted.
+        """
+        if not jobs:
+            return 0
+        self.cur.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS job_master_staging (
+                job_title    TEXT,
+                company_name TEXT,
+                location     TEXT,
+                posted_date  DATE,
+                keyword      TEXT,
+                job_url      TEXT,
+                mobile_url   TEXT
+            );
+            TRUNCATE job_master_staging;
+        """)
+        self.cur.copy_expert(
+            """
+            COPY job_master_staging
+            (job_title, company_name, location, posted_date, keyword, job_url, mobile_url)
+            FROM STDIN WITH (FORMAT csv, FORCE_NULL (posted_date))
+            """,
+            staging_csv(jobs)
+        )
+        self.cur.execute("""
+            INSERT INTO job_master
+            (job_title, company_name, location, posted_date, keyword, job_url, mobile_url,
+             source_portal, create_id, create_date)
+            SELECT s.job_title, s.company_name, s.location, s.posted_date, s.keyword,
+                   s.job_url, s.mobile_url, %s, 'SCRAPER', NOW()
+            FROM job_master_staging s;
+        """, (source_portal,))
+        return self.cur.rowcount
+
+    def relabel_master(self, jobs, source_portal):
+        """
+        Rewrite the Keyword column of today's rows for jobs that more
+        keywords matched after they were inserted. Runs in the caller's
+        transaction. Returns rows updated.
+        """
+        if not jobs:
+            return 0
+        self.cur.executemany("""
+            UPDATE job_master SET keyword = %s
+            WHERE mobile_url = %s AND source_portal = %s AND create_date >= CURRENT_DATE;
+        """, [(job.keyword_label, job.mobile_link, source_portal) for job in jobs])
+        return self.cur.rowcount
+
     # -----------------------------
     # Archive master to history
     # -----------------------------
@@ -151,148 +208,62 @@ class DBClient:
 # LINKEDIN SCRAPER
 # =============================================
 class LinkedInScraper:
-    def __init__(self, location=LOCATION):
+    def __init__(self, location=LOCATION, prefetch=PAGE_PREFETCH, incremental=INCREMENTAL):
         self.location = location
+        self.prefetch = prefetch
+        self.incremental = incremental
 
-    @staticmethod
-    def posted_within_last_week(date_str):
-        try:
-            post_date = datetime.fromisoformat(date_str.replace("Z", ""))
-            return post_date >= datetime.now() - timedelta(days=7)
-        except:
-            return False
-
-    @staticmethod
-    def get_mobile_link(job_link):
-        match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-        return f"https://www.linkedin.com/jobs/view/{match.group(1)}" if match else job_link
-
-    @staticmethod
-    def load_previous_ids(keyword):
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-        filename = f"{keyword.replace(' ', '')}/{keyword.replace(' ', '')}_{yesterday}.xlsx"
-        if not os.path.exists(filename):
-            return set()
-        previous_ids = set()
-        try:
-            wb = load_workbook(filename)
-            ws = wb.active
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                job_link = row[5]  # Job Link column
-                m = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-                if m:
-                    previous_ids.add(m.group(1))
-        except:
-            pass
-        return previous_ids
-
-    async def fetch_jobs_for_keyword(self, client, keyword):
-        url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                          "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-        }
-
+    async def fetch_jobs_for_keyword(self, client, keyword, run_dedupe=None):
         job_postings = []
-        seen_ids_today = set()
-        seen_ids_yesterday = self.load_previous_ids(keyword)
+        seen_ids_before = get_seen_index().load(keyword)
+        crawl_state = get_crawl_state()
 
         print(f"\n🚀 Starting scrape for keyword: {keyword}")
-        print(f"📌 Loaded {len(seen_ids_yesterday)} previous job IDs (for dedupe)")
-
-        page = 0
-        retry = 0
-
-        while True:
-            params = {
-                "keywords": keyword,
-                "location": self.location,
-                "sortBy": "R",
-                "f_TPR": "r86400",
-                "start": page * 25
-            }
-
-            print(f"🔄 Fetching page {page}...")
-
+        print(f"📌 Loaded {len(seen_ids_before)} previous job IDs (for dedupe)")
+
+        watermark = crawl_state.get(keyword) if self.incremental else None
+        page_filter = make_page_filter(keyword, seen_ids_before, watermark, run_dedupe)
+        aborted = False
+
+        async def crawl_query(query):
+            """Crawl one (sub-)query into job_postings. Returns True if it looks saturated."""
+            nonlocal aborted
+            pages = iter_search_pages(client, keyword, query.location,
+                                      prefetch=self.prefetch, max_retry=MAX_RETRY,
+                                      time_window=query.time_window)
+            query_ids = page_filter.query_ids()
             try:
-                resp = await client.get(url, headers=headers, params=params)
-
-                if resp.status_code == 429:
-                    wait_time = random.randint(45, 90)
-                    print(f"🚫 Rate limited (429). Sleeping {wait_time} sec...")
-                    await asyncio.sleep(wait_time)
-                    continue
-
-                if resp.status_code != 200:
-                    print(f"❌ HTTP {resp.status_code} on page {page}")
-                    retry += 1
-                    if retry > MAX_RETRY:
-                        print("❌ Too many failures. Stopping scraper.")
-                        break
-                    await asyncio.sleep(5)
-                    continue
-
-                retry = 0
-                soup = BeautifulSoup(resp.content, "lxml")
-                job_cards = soup.select("li")
-
-                if not job_cards:
-                    print(f"ℹ️ No more jobs found for: {keyword}")
-                    break
-
-                page += 1
-
-                for job in job_cards:
-                    try:
-                        title_tag = job.find("h3")
-                        company_tag = job.find("h4")
-                        location_tag = job.find("span", class_="job-search-card__location")
-                        time_tag = job.find("time")
-                        link_tag = job.find("a", href=True)
-
-                        if not all([title_tag, company_tag, location_tag, time_tag, link_tag]):
-                            continue
-
-                        job_link = link_tag["href"]
-                        mobile_link = self.get_mobile_link(job_link)
-
-                        job_id_match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-                        if not job_id_match:
-                            continue
-                        job_id = job_id_match.group(1)
-
-                        if job_id in seen_ids_today or job_id in seen_ids_yesterday:
-                            continue
-
-                        seen_ids_today.add(job_id)
-
-                        title = title_tag.text.strip()
-                        company = company_tag.text.strip()
-                        location = location_tag.text.strip()
-                        date_posted = time_tag.get("datetime", "")
-
-                        if not self.posted_within_last_week(date_posted):
-                            continue
-
-                        job_postings.append({
-                            "Title": title,
-                            "Company": company,
-                            "Location": location,
-                            "Date Posted": date_posted,
-                            "Keyword": keyword,
-                            "Job Link": job_link,
-                            "Mobile Link": mobile_link
-                        })
-
-                    except Exception as e:
-                        print(f"⚠️ Parse Error: {e}")
-                        continue
-
-                await asyncio.sleep(random.uniform(1.5, 3.5))
+                async for page, job_cards in pages:
+                    # Dedupe, date window and title filters over the whole page at once
+                    kept, new_in_page, page_behind = page_filter.apply(job_cards, query_ids)
+                    job_postings.extend(kept)
+
+                    if page_behind:
+                        print(f"🛑 [{keyword}] Page {page} only has jobs known before today, stopping early")
+                        return False
+                    # Guest search repeats pages / stops at a hard cap once a query is too broad
+                    if new_in_page == 0:
+                        print(f"🔁 [{keyword}] Page {page} only repeats earlier cards ({describe(query)})")
+                        return True
+                    if page + 1 >= MAX_PAGES:
+                        return True
+                return False
 
             except Exception as e:
                 print(f"⚠️ Fatal Error: {e}")
-                break
+                aborted = True
+                return False
+            finally:
+                await pages.aclose()
+
+        queries_run = await run_plan(Query(keyword, self.location, DEFAULT_TIME_WINDOW), crawl_query)
+        if queries_run > 1:
+            print(f"🧭 [{keyword}] Covered with {queries_run} queries")
+
+        # Only a complete crawl may move the watermark, otherwise unseen older pages would be skipped.
+        # It is applied after the keyword's export succeeds (see get_crawl_state().commit).
+        if not aborted and self.incremental:
+            crawl_state.propose(keyword, page_filter.newest)
 
         print(f"✅ Completed '{keyword}' — {len(job_postings)} jobs found.\n")
         return job_postings
@@ -303,192 +274,230 @@ class LinkedInScraper:
 # =============================================
 class Exporter:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.hyperlink_style = ParagraphStyle(
-            'Hyperlink',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=blue,
-            underline=True,
-            leading=14
-        )
-        self.normal_style = ParagraphStyle("Normal", fontSize=11, leading=14)
-
-    @staticmethod
-    def remove_empty_sheet(wb):
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            if sheet_name == "Sheet" and all([cell.value is None for row in ws.iter_rows() for cell in row]):
-                wb.remove(ws)
-
-    def save_excel(self, file_path, sheet_name, jobs):
-        folder = os.path.dirname(file_path)
-        if folder:
-            os.makedirs(folder, exist_ok=True)
-
-        if os.path.exists(file_path):
-            wb = load_workbook(file_path)
-            if sheet_name in wb.sheetnames:
-                del wb[sheet_name]
-        else:
-            wb = Workbook()
-
-        ws = wb.create_sheet(title=sheet_name)
-        headers = ["Title", "Company", "Location", "Date Posted", "Keyword", "Job Link", "Mobile Link"]
-        ws.append(headers)
-
-        for job in jobs:
-            row = [
-                job["Title"],
-                job["Company"],
-                job["Location"],
-                job["Date Posted"],
-                job["Keyword"],
-                job["Job Link"],
-                job["Mobile Link"]
-            ]
-            ws.append(row)
-            ws.cell(row=ws.max_row, column=6).hyperlink = job["Job Link"]
-            ws.cell(row=ws.max_row, column=6).font = Font(color="0000FF", underline="single")
-            ws.cell(row=ws.max_row, column=7).hyperlink = job["Mobile Link"]
-            ws.cell(row=ws.max_row, column=7).font = Font(color="0000FF", underline="single")
-
-        self.remove_empty_sheet(wb)
-        wb.save(file_path)
+        self.workbooks = {}
+        self.file_saves = []    # (keyword, builder, future) of files already handed to the file pool
+
+    def add_sheet(self, file_path, sheet_name, jobs):
+        """Queue a sheet; every workbook is written once by save_workbooks()."""
+        if file_path not in self.workbooks:
+            self.workbooks[file_path] = excel_export.WorkbookBuilder(file_path)
+        self.workbooks[file_path].add_sheet(sheet_name, jobs)
+
+    def save_workbooks(self):
+        """Write all queued workbooks in parallel. Returns (saved paths, seconds)."""
+        started = time.perf_counter()
+        saved = excel_export.save_workbooks(self.workbooks.values())
+        self.workbooks = {}
+        return saved, time.perf_counter() - started
 
     def save_keyword_files(self, keyword, jobs):
+        """Hand the keyword's own Excel and Word + PDF to the file pool; wait_keyword_files() collects them."""
         date_code = datetime.now().strftime("%Y%m%d")
         folder = keyword.replace(" ", "")
         os.makedirs(folder, exist_ok=True)
 
         # Per-keyword Excel
         kw_excel = os.path.join(folder, f"{folder}_{date_code}_jobs.xlsx")
-        self.save_excel(kw_excel, sheet_name=keyword.replace(" ", ""), jobs=jobs)
+        workbook = excel_export.WorkbookBuilder(kw_excel).add_sheet(keyword.replace(" ", ""), jobs)
 
         # Per-keyword Word + PDF
         kw_docx = os.path.join(folder, f"{folder}_{date_code}_jobs.docx")
         kw_pdf = os.path.join(folder, f"{folder}_{date_code}_jobs.pdf")
-        self.save_keyword_documents(jobs, kw_docx, kw_pdf)
+        documents = document_export.KeywordDocuments(kw_docx, kw_pdf, append=False).add_jobs(jobs)
 
+        for builder in (workbook, documents):
+            self.file_saves.append((keyword, builder, submit_save(builder)))
         return kw_excel, kw_docx, kw_pdf
 
-    def save_keyword_documents(self, jobs, docx_file, pdf_file):
-        doc = Document()
-
-        for job in jobs:
-            p = doc.add_paragraph()
-            p.add_run("🧾 Title: ").bold = True
-            p.add_run(job["Title"])
-
-            p = doc.add_paragraph()
-            p.add_run("🏢 Company: ").bold = True
-            p.add_run(job["Company"])
-
-            p = doc.add_paragraph()
-            p.add_run("📍 Location: ").bold = True
-            p.add_run(job["Location"])
-
-            p = doc.add_paragraph()
-            p.add_run("📅 Posted: ").bold = True
-            p.add_run(job["Date Posted"])
-
-            p = doc.add_paragraph()
-            p.add_run("🔗 Link: ").bold = True
-            self.add_hyperlink(p, job["Mobile Link"], job["Mobile Link"])
-
-            p = doc.add_paragraph()
-            p.add_run("🔗 Web Link: ").bold = True
-            self.add_hyperlink(p, job["Job Link"], job["Job Link"])
-
-            doc.add_paragraph("-" * 80)
-
-        doc.save(docx_file)
-        self.convert_docx_to_pdf(docx_file, pdf_file)
-
-    @staticmethod
-    def add_hyperlink(paragraph, text, url):
-        part = paragraph.part
-        r_id = part.relate_to(
-            url,
-            "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
-            is_external=True
-        )
-        hyperlink = OxmlElement("w:hyperlink")
-        hyperlink.set(qn("r:id"), r_id)
-
-        new_run = OxmlElement("w:r")
-        rPr = OxmlElement("w:rPr")
-        u = OxmlElement("w:u")
-        u.set(qn("w:val"), "single")
-        rPr.append(u)
-        color = OxmlElement("w:color")
-        color.set(qn("w:val"), "0000FF")
-        rPr.append(color)
-        new_run.append(rPr)
-        t = OxmlElement("w:t")
-        t.text = text
-        new_run.append(t)
-        hyperlink.append(new_run)
-        paragraph._p.append(hyperlink)
-        return hyperlink
-
-    @staticmethod
-    def convert_docx_to_pdf(docx_file, pdf_file):
-        doc = Document(docx_file)
-        story = []
-        styles = getSampleStyleSheet()
-        normal_style = styles['Normal']
-        hyperlink_style = ParagraphStyle('Hyperlink', parent=normal_style, fontSize=11, textColor=blue, underline=True)
-        for para in doc.paragraphs:
-            text = para.text
-            style_to_use = hyperlink_style if "🔗" in text else normal_style
-            story.append(Paragraph(text, style_to_use))
-            story.append(Spacer(1, 12))
-        pdf = SimpleDocTemplate(pdf_file, pagesize=LETTER)
-        pdf.build(story)
+    def wait_keyword_files(self):
+        """
+        Wait for the keyword files still being written. Returns (saved paths,
+        keywords with a failed file, seconds waited).
+        """
+        started = time.perf_counter()
+        saved, failed = [], set()
+        for keyword, builder, future in self.file_saves:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ Writing {builder.__class__.__name__} failed for {keyword}: {e}")
+                failed.add(keyword)
+                continue
+            if isinstance(builder, document_export.KeywordDocuments):
+                if result:
+                    saved.append(builder.docx_file)
+            elif result:
+                saved.append(result)
+        self.file_saves = []
+        shutdown_file_pool()
+        return saved, failed, time.perf_counter() - started
 
 
 # =============================================
 # SCRAPER RUNNER
 # =============================================
 class ScraperRunner:
-    def __init__(self, db: DBClient, scraper: LinkedInScraper, exporter: Exporter, keywords: list):
+    def __init__(self, db: DBClient, export_db: DBClient, scraper: LinkedInScraper, exporter: Exporter,
+                 keywords: list, concurrency: int = KEYWORD_CONCURRENCY):
         self.db = db
+        # The export worker gets its own connection, so its transactions never hold up the scrape loop
+        self.export_db = export_db
         self.scraper = scraper
         self.exporter = exporter
         self.keywords = keywords
+        self.concurrency = max(1, concurrency)
+        self.run_dedupe = RunDedupe()
+        self.released = []      # (keyword, jobs) handed to the export worker, for the daily workbook
 
-    async def run(self, client):
-        for keyword in self.keywords:
+    async def _scrape_keyword(self, client, keyword, semaphore, run_dedupe):
+        async with semaphore:
             run_id = self.db.log_run_start(keyword, SOURCE_PORTAL)
-            self.db.start_transaction()
+            started = time.perf_counter()
+            jobs = await self.scraper.fetch_jobs_for_keyword(client, keyword, run_dedupe)
+            return run_id, jobs, time.perf_counter() - started
 
+    async def scrape_all(self, client, on_keyword=None):
+        """
+        Scrape every keyword concurrently (bounded by self.concurrency).
+        Returns {keyword: (run_id, jobs, elapsed)} in keyword order; a job
+        matched by several keywords is kept once, under the first of them,
+        labelled with that keyword only and listed newest first;
+        relabel_keywords() adds the other keywords once all are done.
+        A keyword's batch is final once it and every keyword before it are
+        done, and is passed to `await on_keyword(keyword, run_id, jobs, elapsed)`
+        right away, while later keywords are still scraping.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        run_dedupe = self.run_dedupe
+        repost_detector = get_repost_detector()
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._scrape_keyword(client, keyword, semaphore, run_dedupe))
+                 for keyword in self.keywords]
+        scraped = {}
+        for keyword, task in zip(self.keywords, tasks):
             try:
-                jobs = await self.scraper.fetch_jobs_for_keyword(client, keyword)
-                if not jobs:
-                    print(f"ℹ️ No jobs found for keyword '{keyword}'")
-                    self.db.log_run_end(run_id, 0)
-                    self.db.rollback_transaction()
-                    continue
-
-                # Export Excel + Word + PDF
-                date_code = datetime.now().strftime("%Y%m%d")
-                main_excel = f"Job_Extract_{date_code}.xlsx"
-                self.exporter.save_excel(main_excel, keyword.replace(" ", ""), jobs)
-                kw_excel, kw_docx, kw_pdf = self.exporter.save_keyword_files(keyword, jobs)
-
-                # Insert into DB
-                for job in jobs:
-                    self.db.upsert_master(job, SOURCE_PORTAL)
-
-                # Commit all changes
-                self.db.commit_transaction()
-                self.db.log_run_end(run_id, len(jobs))
-                print(f"🎉 Completed keyword '{keyword}' — {len(jobs)} jobs inserted.\n")
-
+                run_id, _, elapsed = await task
             except Exception as e:
-                print(f"❌ Transaction rolled back for keyword '{keyword}' due to error: {e}")
-                self.db.rollback_transaction()
+                print(f"❌ Scrape failed for keyword '{keyword}': {e}")
+                continue
+            # Near-duplicate reposts (new job id, same role) are collapsed before anything is exported
+            owned = run_dedupe.owned_by(keyword, self.keywords)
+            jobs = repost_detector.process(owned)
+            if len(jobs) < len(owned):
+                # Collapsed reposts are never exported; mark them seen so later runs skip them
+                # instead of counting them as new on every page (which also blocks the early stop)
+                get_seen_index().record([job for job in owned if job.repost_of is not None])
+            scraped[keyword] = (run_id, jobs, elapsed)
+            if on_keyword is not None:
+                await on_keyword(keyword, run_id, jobs, elapsed)
+        wall = time.perf_counter() - started
+
+        # Summed task time, not a serial baseline: keywords share one host limiter
+        task_time = sum(elapsed for _, _, elapsed in scraped.values())
+        print(f"⏱️ Scraped {len(self.keywords)} keywords in {wall:.1f}s "
+              f"(summed keyword task time {task_time:.1f}s, concurrency {self.concurrency})")
+        for line in limiter_summary():
+            print(f"🚦 {line}")
+        print(f"💾 {get_response_cache().summary()}")
+        print(f"🔗 Run dedupe: {run_dedupe.summary()}")
+        print(f"♻️ {repost_detector.summary()}")
+        return scraped
+
+    def export_keyword(self, keyword, run_id, jobs, elapsed, exported):
+        """
+        Keyword files (handed to the file pool) and Parquet snapshot, then
+        one DB transaction on the export connection, for a finished keyword.
+        Runs on the export worker thread, in keyword order.
+        """
+        if not jobs:
+            print(f"ℹ️ No jobs found for keyword '{keyword}'")
+            self.export_db.log_run_end(run_id, 0)
+            exported.append((keyword, jobs))
+            return
+
+        try:
+            # Keyword files go to the file pool now; the daily sheet waits for the final labels
+            self.released.append((keyword, jobs))
+            self.exporter.save_keyword_files(keyword, jobs)
+            parquet_snapshot.write_snapshot(keyword, jobs)
+        except Exception as e:
+            print(f"❌ Export failed for keyword '{keyword}', nothing inserted: {e}")
+            self.export_db.log_run_end(run_id, 0)
+            return
+
+        self.export_db.start_transaction()
+
+        try:
+            # Insert into DB: one COPY + INSERT ... SELECT for the whole keyword
+            inserted = self.export_db.ingest_master(jobs, SOURCE_PORTAL)
+
+            # Commit all changes
+            self.export_db.commit_transaction()
+            self.export_db.log_run_end(run_id, inserted)
+            exported.append((keyword, jobs))
+            print(f"🎉 Completed keyword '{keyword}' — {inserted} jobs inserted ({elapsed:.1f}s scrape).\n")
+
+        except Exception as e:
+            print(f"❌ Transaction rolled back for keyword '{keyword}' due to error: {e}")
+            self.export_db.rollback_transaction()
+            self.export_db.log_run_end(run_id, 0)
+
+    def relabel_keywords(self):
+        """
+        Last export task, once every keyword has been scraped: give released
+        jobs every keyword that matched them and rewrite job_master's Keyword
+        column for the ones more than one keyword matched.
+        """
+        jobs = [job for _, keyword_jobs in self.released for job in self.run_dedupe.settle(keyword_jobs)]
+        shared = [job for job in jobs if len(job.keywords) > 1]
+        if not shared:
+            return
+        self.export_db.start_transaction()
+        try:
+            updated = self.export_db.relabel_master(shared, SOURCE_PORTAL)
+            self.export_db.commit_transaction()
+            print(f"🏷️ {updated} job_master rows relabelled with every matched keyword")
+        except Exception:
+            self.export_db.rollback_transaction()
+            raise
+
+    async def run(self, client):
+        # Finished keywords are exported in the background while the rest are still scraping
+        export_queue = ExportQueue()
+        exported = []
+
+        async def queue_export(keyword, run_id, jobs, elapsed):
+            await export_queue.submit(self.export_keyword, keyword, run_id, jobs, elapsed, exported)
+
+        try:
+            await self.scrape_all(client, on_keyword=queue_export)
+            # Labels are final now; queued behind the exports so nothing is still reading the jobs
+            await export_queue.submit(self.relabel_keywords)
+        finally:
+            export_queue.drain()
+        print(f"🧵 {export_queue.summary()}")
+
+        # Keyword files were written in the pool while scraping; wait for any still running
+        files, failed, files_wait = self.exporter.wait_keyword_files()
+        for file_path in files:
+            print(f"📁 Saved: {file_path}")
+        # The daily extract needs every keyword's sheet and final labels, so it is the one file written after scraping
+        main_excel = f"Job_Extract_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        for keyword, jobs in self.released:
+            self.exporter.add_sheet(main_excel, keyword.replace(" ", ""), jobs)
+        saved, excel_time = self.exporter.save_workbooks()
+        for file_path in saved:
+            print(f"📁 Saved Excel: {file_path}")
+        print(f"📤 Export: after scraping waited {files_wait:.1f}s on keyword files, daily workbook "
+              f"{excel_time:.1f}s (background export {export_queue.busy:.1f}s)")
+
+        # Seen ids and watermarks are recorded here, on the thread that owns them,
+        # for keywords whose files and DB transaction all succeeded
+        for keyword, jobs in exported:
+            if keyword in failed:
+                continue
+            get_seen_index().record(self.run_dedupe.settle(jobs))
+            get_crawl_state().commit(keyword)
 
 
 # =============================================
@@ -501,12 +510,16 @@ async def main():
 
     scraper = LinkedInScraper()
     exporter = Exporter()
-    runner = ScraperRunner(db, scraper, exporter, KEYWORDS)
+    export_db = DBClient()
+    runner = ScraperRunner(db, export_db, scraper, exporter, KEYWORDS)
 
-    async with httpx.AsyncClient(timeout=45.0) as client:
+    async with create_client() as client:
         await runner.run(client)
+        print_connection_stats(client)
+    shutdown_parse_pool()
 
     db.close()
+    export_db.close()
 
 
 # ---------------------------------------------
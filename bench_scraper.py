@@ -0,0 +1,204 @@
+# bench_scraper.py
+#
+# Offline, repeatable throughput benchmark on a recorded archive.
+# Record one first by setting http_client.RECORD_ARCHIVE for a live run, then:
+#
+#   python bench_scraper.py fixtures/run.zip --latency 0.3 --concurrency 4
+#
+# --db also times job_master ingestion against the Postgres in db_client.py
+# (rows are tagged with a bench portal and deleted afterwards).
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import document_export
+import excel_export
+import http_client
+import main_v8
+import rate_limiter
+from export_queue import shutdown_file_pool, submit_save
+from job_extractor import BACKENDS, StreamingCardParser, get_extractor
+from linkedin_search import SEARCH_HOST, shutdown_parse_pool
+from replay import ReplayTransport, load_archive
+from response_cache import get_response_cache
+
+
+def archive_keywords(responses):
+    keywords = []
+    for key in responses:
+        query = parse_qs(urlsplit(key.split(" ", 1)[1]).query)
+        for kw in query.get("keywords", []):
+            if kw not in keywords:
+                keywords.append(kw)
+    return keywords
+
+
+# Non-ASCII card (no charset declaration, like the real fragments) so parity covers decoding too
+PARITY_PAGE = ('<li><a href="https://www.linkedin.com/jobs/view/ingenieur-logiciel-4000000001?refId=x">x</a>'
+               '<h3>Ingénieur logiciel – Zürich</h3><h4>Société Générale</h4>'
+               '<span class="job-search-card__location">Zürich, Schweiz</span>'
+               '<time datetime="2026-01-01"></time></li>').encode("utf-8")
+
+
+def _stream_parse(body, chunk_size=7):
+    # Small chunks so multi-byte characters get split across feed() calls
+    parser = StreamingCardParser()
+    records = []
+    for i in range(0, len(body), chunk_size):
+        records.extend(parser.feed(body[i:i + chunk_size]))
+    return records + parser.close()
+
+
+def bench_parse(responses):
+    """Cards/s per extractor backend, plus a parity check against bs4 (streaming parser included)."""
+    bodies = [body for status, _, body in responses.values() if status == 200 and body] + [PARITY_PAGE]
+    reference = [get_extractor("bs4").extract(body) for body in bodies]
+
+    parity_ok = True
+    for name in BACKENDS:
+        extractor = get_extractor(name)
+        started = time.perf_counter()
+        pages = [extractor.extract(body) for body in bodies]
+        elapsed = time.perf_counter() - started
+        cards = sum(len(page) for page in pages)
+
+        mismatches = sum(1 for got, want in zip(pages, reference) if got != want)
+        parity_ok = parity_ok and not mismatches
+        parity = "parity ok" if not mismatches else f"❌ {mismatches} page(s) differ from bs4"
+        print(f"🧪 Parse [{name:>10}]: {len(bodies)} pages, {cards} cards in {elapsed:.3f}s "
+              f"({cards / elapsed if elapsed else 0:.0f} cards/s) | {parity}")
+
+    mismatches = sum(1 for body, want in zip(bodies, reference) if _stream_parse(body) != want)
+    parity_ok = parity_ok and not mismatches
+    print(f"🧪 Parse [    stream]: {'parity ok' if not mismatches else f'❌ {mismatches} page(s) differ from bs4'}")
+    return parity_ok
+
+
+async def bench_fetch(archive, keywords, latency, concurrency):
+    # Measure the scraper, not the politeness settings or the disk cache
+    get_response_cache().ttl = 0
+    limiter = rate_limiter.get_limiter(SEARCH_HOST)
+    limiter.rate = limiter.max_rate = 1000.0
+    limiter.burst = 1000
+    main_v8.INCREMENTAL = False
+
+    transport = ReplayTransport(archive, latency=latency)
+    async with http_client.create_client(transport=transport) as client:
+        started = time.perf_counter()
+        results = await main_v8.scrape_all_keywords(client, _NoDB(), keywords, concurrency)
+        elapsed = time.perf_counter() - started
+
+    jobs = {kw: result[1] for kw, result in results.items()}
+    total = sum(len(j) for j in jobs.values())
+    print(f"🧪 Fetch : {transport.served} pages replayed ({transport.missing} missing), "
+          f"{total} jobs in {elapsed:.2f}s ({transport.served / elapsed if elapsed else 0:.1f} pages/s)")
+    return jobs
+
+
+def bench_export(jobs):
+    started = time.perf_counter()
+    workbook = excel_export.WorkbookBuilder("bench_extract.xlsx")
+    for keyword, keyword_jobs in jobs.items():
+        workbook.add_sheet(keyword, keyword_jobs)
+    workbook.save()
+    rows = workbook.rows
+    elapsed = time.perf_counter() - started
+    print(f"🧪 Export: {rows} rows to Excel in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+def bench_documents(jobs):
+    """Word + PDF per keyword, plus a render check on a document long enough to span many pages."""
+    started = time.perf_counter()
+    builders = [document_export.KeywordDocuments(f"bench_{i}.docx", f"bench_{i}.pdf", append=False)
+                .add_jobs(keyword_jobs) for i, keyword_jobs in enumerate(jobs.values())]
+    added = sum(future.result() for future in [submit_save(builder) for builder in builders])
+    shutdown_file_pool()
+    elapsed = time.perf_counter() - started
+    print(f"🧪 Documents: {added} jobs to Word + PDF in {elapsed:.2f}s ({added / elapsed if elapsed else 0:.0f} jobs/s)")
+
+    # Real-length tracking links wrap over several lines, so 60 jobs run well past one page
+    link = "https://www.linkedin.com/jobs/view/senior-backend-developer-at-societe-generale-{0}" \
+           "?position={1}&pageNum=0&refId=AbCdEfGhIjKlMnOpQrStUv%3D%3D&trackingId=ZyXwVuTsRqPoNmLkJiHgFe%3D%3D"
+    records = [{"job_id": 4000000000 + i, "title": f"Senior Backend Developer {i}", "company": "Société Générale",
+                "location": "Austin, Texas, United States", "date_posted": "2026-01-01",
+                "mobile_link": f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+                "job_link": link.format(4000000000 + i, i)} for i in range(60)]
+    pages = document_export.render_pdf("bench_pages.pdf", records)
+    print(f"🧪 Documents: 60-job PDF rendered on {pages} pages")
+    return pages > 1
+
+
+BENCH_PORTAL = "BENCH"
+
+
+def _clear_bench_rows(db):
+    db.cur.execute("DELETE FROM job_master WHERE source_portal = %s", (BENCH_PORTAL,))
+    db.conn.commit()
+
+
+def bench_ingest(jobs):
+    """Rows/s into job_master: one upsert_master per job vs one ingest_master per keyword."""
+    # Imported here so the offline benchmarks run without psycopg2 / Postgres
+    from db_client import DBClient
+
+    db = DBClient()
+    rows = sum(len(keyword_jobs) for keyword_jobs in jobs.values())
+    try:
+        _clear_bench_rows(db)
+        started = time.perf_counter()
+        for keyword_jobs in jobs.values():
+            for job in keyword_jobs:
+                db.upsert_master(job, BENCH_PORTAL)
+        per_row = time.perf_counter() - started
+        _clear_bench_rows(db)
+
+        started = time.perf_counter()
+        inserted = sum(db.ingest_master(keyword_jobs, BENCH_PORTAL) for keyword_jobs in jobs.values())
+        bulk = time.perf_counter() - started
+    finally:
+        _clear_bench_rows(db)
+        db.close()
+
+    print(f"🧪 Ingest [per-row]: {rows} rows in {per_row:.2f}s ({rows / per_row if per_row else 0:.0f} rows/s)")
+    print(f"🧪 Ingest [   bulk]: {inserted} rows in {bulk:.2f}s ({inserted / bulk if bulk else 0:.0f} rows/s, "
+          f"{per_row / bulk if bulk else 0:.1f}x)")
+
+
+class _NoDB:
+    """Run-log stand-in so the benchmark never needs Postgres."""
+    def log_run_start(self, keyword, source_portal):
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded archive and report throughput")
+    parser.add_argument("archive")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per replayed response")
+    parser.add_argument("--concurrency", type=int, default=main_v8.KEYWORD_CONCURRENCY)
+    parser.add_argument("--keywords", nargs="*", help="defaults to every keyword in the archive")
+    parser.add_argument("--db", action="store_true", help="also benchmark job_master ingestion")
+    args = parser.parse_args()
+
+    archive = os.path.abspath(args.archive)
+    responses = load_archive(archive)
+    keywords = args.keywords or archive_keywords(responses)
+    print(f"📼 {len(responses)} recorded responses, keywords: {', '.join(keywords)}")
+
+    # Work in a scratch dir so previous-day files / watermarks never leak in
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        bench_parse(responses)
+        jobs = asyncio.run(bench_fetch(archive, keywords, args.latency, args.concurrency))
+        shutdown_parse_pool()
+        bench_export(jobs)
+        bench_documents(jobs)
+        if args.db:
+            bench_ingest(jobs)
+
+
+if __name__ == "__main__":
+    main()
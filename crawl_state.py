@@ -0,0 +1,76 @@
+# crawl_state.py
+
+import json
+import os
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+STATE_FILE = "crawl_state.json"
+
+
+# ---------------------------------------------
+# PER-KEYWORD HIGH-WATER MARKS
+# ---------------------------------------------
+class CrawlState:
+    """
+    Newest (posted date, job id) seen per keyword on the last complete crawl.
+    Search results are sorted most-recent first, so once a whole page sits at
+    or behind the watermark everything after it is already known.
+    A crawl only propose()s its mark; commit() applies it once the keyword's
+    export and DB insert have succeeded, so a failed export is re-fetched.
+    """
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.watermarks = {}
+        self.pending = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.watermarks = json.load(f)
+            except (OSError, ValueError):
+                print(f"⚠️ Could not read {path}, starting without watermarks")
+
+    def get(self, keyword):
+        mark = self.watermarks.get(keyword)
+        if not mark:
+            return None
+        return mark["posted"], mark["job_id"]
+
+    def advance(self, keyword, newest):
+        """Move the keyword's watermark forward to `newest` = (posted, job_id)."""
+        if newest is None:
+            return
+        current = self.get(keyword)
+        if current is not None and newest <= current:
+            return
+        posted, job_id = newest
+        self.watermarks[keyword] = {"posted": posted, "job_id": job_id}
+        self.save()
+
+    def propose(self, keyword, newest):
+        """Hold a complete crawl's newest mark until commit()."""
+        if newest is not None:
+            self.pending[keyword] = newest
+
+    def commit(self, keyword):
+        """Apply the keyword's proposed mark, once its jobs are exported and inserted."""
+        self.advance(keyword, self.pending.pop(keyword, None))
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.watermarks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+# ---------------------------------------------
+# SHARED STATE
+# ---------------------------------------------
+_state = None
+
+def get_crawl_state():
+    global _state
+    if _state is None:
+        _state = CrawlState()
+    return _state
@@ -0,0 +1,69 @@
+# csv_sink.py
+
+import csv
+import gzip
+import io
+import os
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+BUFFER_SIZE = 64 * 1024     # bytes buffered between flushes
+
+
+# ---------------------------------------------
+# STREAMING CSV SINK
+# ---------------------------------------------
+class StreamingCsvSink:
+    """
+    CSV writer fed page by page while a keyword is being scraped. Rows are
+    value lists in `fieldnames` order.
+
+    Rows go to `<path>.part` through a buffered (optionally gzip) stream that
+    is flushed after every write_rows(), so a crash mid-pagination still
+    leaves every finished page on disk. close() renames the part file onto
+    `path` in one step; after an exception the .part file is left in place.
+    """
+    def __init__(self, path, fieldnames, compress=False, buffer_size=BUFFER_SIZE):
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.rows = 0
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        raw = open(self.part_path, "wb", buffering=buffer_size)
+        # Sync flushes keep the gzip stream decodable up to the last full page
+        self.gzip = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else None
+        self.raw = raw
+        self.text = io.TextIOWrapper(self.gzip or raw, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(fieldnames)
+        self.flush()
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+        self.rows += len(rows)
+        self.flush()
+
+    def flush(self):
+        self.text.flush()
+        if self.gzip is not None:
+            self.gzip.flush()
+        self.raw.flush()
+
+    def close(self, finalize=True):
+        self.text.close()       # closes the gzip stream and the file underneath
+        if self.gzip is not None:
+            self.raw.close()
+        if finalize:
+            os.replace(self.part_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(finalize=exc_type is None)
+        return False
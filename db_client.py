@@ -1,5 +1,8 @@
 # db_client.py
 
+import csv
+import io
+
 import psycopg2
 from datetime import datetime
 
@@ -57,13 +60,13 @@ class DBClient:
             RETURNING job_id;
             """
         values = (
-            job["Title"],
-            job["Company"],
-            job["Location"],
-            job["Date Posted"],
-            job["Keyword"],
-            job["Job Link"],
-            job["Mobile Link"],
+            job.title,
+            job.company,
+            job.location,
+            job.date_posted,
+            job.keyword_label,
+            job.job_link,
+            job.mobile_link,
             source_portal
         )
         self.cur.execute(sql, values)
@@ -71,6 +74,74 @@ class DBClient:
         self.conn.commit()
         return job_id
 
+    # -----------------------------
+    # BULK INGEST INTO job_master
+    # -----------------------------
+    def ingest_master(self, jobs, source_portal):
+        """
+        Load a whole keyword batch at once: COPY into a session-local staging
+        table, then one plain INSERT ... SELECT into job_master (the same rows
+        upsert_master would insert one by one) and a single commit. Returns
+        the number of rows inserted. On failure the transaction is rolled
+        back, so the connection stays usable for the next keyword.
+        """
+        if not jobs:
+            return 0
+        try:
+            self.cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS job_master_staging (
+                    job_title    TEXT,
+                    company_name TEXT,
+                    location     TEXT,
+                    posted_date  DATE,
+                    keyword      TEXT,
+                    job_url      TEXT,
+                    mobile_url   TEXT
+                );
+                TRUNCATE job_master_staging;
+            """)
+            self.cur.copy_expert(
+                """
+                COPY job_master_staging
+                (job_title, company_name, location, posted_date, keyword, job_url, mobile_url)
+                FROM STDIN WITH (FORMAT csv, FORCE_NULL (posted_date))
+                """,
+                staging_csv(jobs)
+            )
+            self.cur.execute("""
+                INSERT INTO job_master
+                (job_title, company_name, location, posted_date, keyword, job_url, mobile_url,
+                 source_portal, create_id, create_date)
+                SELECT s.job_title, s.company_name, s.location, s.posted_date, s.keyword,
+                       s.job_url, s.mobile_url, %s, 'SCRAPER', NOW()
+                FROM job_master_staging s;
+            """, (source_portal,))
+            inserted = self.cur.rowcount
+            self.conn.commit()
+            return inserted
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def relabel_master(self, jobs, source_portal):
+        """
+        Rewrite the Keyword column of today's rows for jobs that more
+        keywords matched after they were inserted. Returns rows updated.
+        """
+        if not jobs:
+            return 0
+        try:
+            self.cur.executemany("""
+                UPDATE job_master SET keyword = %s
+                WHERE mobile_url = %s AND source_portal = %s AND create_date >= CURRENT_DATE;
+            """, [(job.keyword_label, job.mobile_link, source_portal) for job in jobs])
+            updated = self.cur.rowcount
+            self.conn.commit()
+            return updated
+        except Exception:
+            self.conn.rollback()
+            raise
+
     # -----------------------------
     # ARCHIVE MASTER TO HISTORY
     # -----------------------------
@@ -122,3 +193,20 @@ class DBClient:
         self.cur.close()
         self.conn.close()
         print("🟢 Database connection closed")
+
+
+def staging_csv(jobs):
+    """
+    In-memory CSV of jobs in job_master_staging column order for COPY. Every
+    field is quoted, so empty strings stay empty; a missing posted_date
+    becomes NULL through FORCE_NULL.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+    writer.writerows(
+        (job.title, job.company, job.location, job.date_posted or "",
+         job.keyword_label, job.job_link, job.mobile_link)
+        for job in jobs
+    )
+    buffer.seek(0)
+    return buffer
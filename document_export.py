@@ -0,0 +1,239 @@
+# document_export.py
+
+import json
+import os
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+import export_cache
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from reportlab.lib.colors import blue
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+JOURNAL_SUFFIX = ".jobs.jsonl"      # <docx>.jobs.jsonl: records already in the document
+SEPARATOR = "-" * 80
+MARGIN = inch                       # PDF page margin
+TEMPLATE_VERSION = 1                # bump when the DOCX or PDF layout changes
+
+# Paragraph label → record field, in document order
+FIELDS = [
+    ("🧾 Title: ", "title"),
+    ("🏢 Company: ", "company"),
+    ("📍 Location: ", "location"),
+    ("📅 Posted: ", "date_posted"),
+    ("🔗 Link: ", "mobile_link"),
+    ("🔗 Web Link: ", "job_link"),
+]
+LINK_FIELDS = {"mobile_link", "job_link"}
+
+
+def job_record(job):
+    """Plain dict of the fields a document shows for one JobPosting."""
+    return {"job_id": job.job_id, "title": job.title, "company": job.company,
+            "location": job.location, "date_posted": job.date_posted,
+            "mobile_link": job.mobile_link, "job_link": job.job_link}
+
+
+# ---------------------------------------------
+# DOCX
+# ---------------------------------------------
+def add_hyperlink(paragraph, text, url):
+    part = paragraph.part
+    r_id = part.relate_to(
+        url,
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
+        is_external=True
+    )
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), r_id)
+
+    new_run = OxmlElement("w:r")
+    rPr = OxmlElement("w:rPr")
+    u = OxmlElement("w:u")
+    u.set(qn("w:val"), "single")
+    rPr.append(u)
+    color = OxmlElement("w:color")
+    color.set(qn("w:val"), "0000FF")  # blue
+    rPr.append(color)
+    new_run.append(rPr)
+    t = OxmlElement("w:t")
+    t.text = text
+    new_run.append(t)
+    hyperlink.append(new_run)
+    paragraph._p.append(hyperlink)
+    return hyperlink
+
+
+def add_job(doc, record):
+    """Append one job's paragraphs (labels bold, links clickable) and the separator line."""
+    for label, field in FIELDS:
+        p = doc.add_paragraph()
+        p.add_run(label).bold = True
+        value = record[field] or ""
+        if field in LINK_FIELDS:
+            add_hyperlink(p, value, value)
+        else:
+            p.add_run(value)
+    doc.add_paragraph(SEPARATOR)
+
+
+def _records_from_docx(docx_file):
+    """Recover job records from a document written before journals existed."""
+    records, record = [], {}
+    for para in Document(docx_file).paragraphs:
+        text = para.text
+        if text == SEPARATOR:
+            if record:
+                records.append(record)
+            record = {}
+            continue
+        for label, field in FIELDS:
+            if text.startswith(label):
+                record[field] = text[len(label):].strip()
+                break
+    for record in records:
+        link = record.get("mobile_link") or record.get("job_link") or ""
+        record["job_id"] = link.rstrip("/").rsplit("/", 1)[-1]
+    return records
+
+
+# ---------------------------------------------
+# PDF
+# ---------------------------------------------
+@lru_cache(maxsize=None)
+def pdf_styles():
+    """Paragraph styles, built once per process and shared by every PDF."""
+    styles = getSampleStyleSheet()
+    hyperlink_style = ParagraphStyle(
+        'Hyperlink',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=blue,
+        underline=True,
+        leading=14
+    )
+    normal_style = ParagraphStyle("Normal", fontSize=11, leading=14)
+    return normal_style, hyperlink_style
+
+
+@lru_cache(maxsize=None)
+def page_template():
+    """Single-frame LETTER page (SimpleDocTemplate's layout), reused across documents."""
+    width, height = LETTER
+    frame = Frame(MARGIN, MARGIN, width - 2 * MARGIN, height - 2 * MARGIN, id="normal")
+    return PageTemplate(id="Job", frames=[frame], pagesize=LETTER)
+
+
+def job_story(records):
+    """ReportLab flowables for the records, in the same layout as the DOCX."""
+    normal_style, hyperlink_style = pdf_styles()
+    story = []
+    for record in records:
+        for label, field in FIELDS:
+            value = escape(str(record[field] or ""))
+            if field in LINK_FIELDS:
+                story.append(Paragraph(f'{label}<a href="{value}">{value}</a>', hyperlink_style))
+            else:
+                story.append(Paragraph(label + value, normal_style))
+            # A fresh Spacer each time: platypus sizes flowables in place, so a shared one breaks across pages
+            story.append(Spacer(1, 12))
+        story.append(Paragraph(SEPARATOR, normal_style))
+        story.append(Spacer(1, 12))
+    return story
+
+
+def render_pdf(pdf_file, records):
+    """Write the PDF straight from job records (no DOCX round trip). Returns the page count."""
+    tmp_path = f"{pdf_file}.tmp"
+    pdf = BaseDocTemplate(tmp_path, pagesize=LETTER, pageTemplates=[page_template()])
+    pdf.build(job_story(records))
+    os.replace(tmp_path, pdf_file)
+    return pdf.page
+
+
+# ---------------------------------------------
+# SINGLE-PASS KEYWORD DOCUMENTS
+# ---------------------------------------------
+class KeywordDocuments:
+    """
+    One keyword's DOCX and PDF, written once per run in save() however many
+    jobs were added. With `append`, jobs from an earlier run of the same day
+    are kept: they come from a JSON-lines journal next to the DOCX, so the
+    existing document is never parsed again, and the run only appends its
+    new records to the journal. Jobs already in the document are skipped.
+    The PDF is rendered from the same records rather than from the DOCX.
+    Records are plain dicts, so a builder pickles cheaply into a worker.
+    Both files are left alone when they were last written from the same
+    records and template version.
+    """
+    def __init__(self, docx_file, pdf_file, append=True):
+        self.docx_file = docx_file
+        self.pdf_file = pdf_file
+        self.journal_file = docx_file + JOURNAL_SUFFIX
+        self.append = append
+        self.records = []
+
+    def add_jobs(self, jobs):
+        self.records.extend(job_record(job) for job in jobs)
+        return self
+
+    def _previous_records(self):
+        if not self.append:
+            return []
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        if os.path.exists(self.docx_file):
+            # One-off migration of a document that has no journal yet
+            records = _records_from_docx(self.docx_file)
+            self._write_journal(records, "w")
+            return records
+        return []
+
+    def _write_journal(self, records, mode):
+        with open(self.journal_file, mode, encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def save(self):
+        """Write the DOCX and PDF. Returns the number of jobs added by this run."""
+        previous = self._previous_records()
+        known = {str(record["job_id"]) for record in previous}
+        new = []
+        for record in self.records:
+            key = str(record["job_id"])
+            if key not in known:
+                known.add(key)
+                new.append(record)
+        records = previous + new
+        if not records:
+            return 0
+        digest = export_cache.content_digest(TEMPLATE_VERSION, records)
+        if export_cache.is_current(self.docx_file, digest) and export_cache.is_current(self.pdf_file, digest):
+            print(f"⏭️ Word + PDF unchanged, kept: {self.docx_file}")
+            return 0
+
+        folder = os.path.dirname(self.docx_file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        doc = Document()
+        for record in records:
+            add_job(doc, record)
+        tmp_path = f"{self.docx_file}.tmp"
+        doc.save(tmp_path)
+        os.replace(tmp_path, self.docx_file)
+        render_pdf(self.pdf_file, records)
+
+        self._write_journal(new, "a" if self.append else "w")
+        export_cache.mark(self.docx_file, digest)
+        export_cache.mark(self.pdf_file, digest)
+        return len(new)
+
@@ -0,0 +1,144 @@
+# excel_export.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle
+
+import export_cache
+from job_posting import COLUMNS
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+LINK_STYLE = "Job Link"                 # named style shared by every hyperlink cell
+LINK_INDEXES = (COLUMNS.index("Job Link"), COLUMNS.index("Mobile Link"))
+EXPORT_WORKERS = None                   # processes writing workbooks in parallel (None = CPU count)
+TEMPLATE_VERSION = 1                    # bump when the sheet layout or styling changes
+
+
+# ---------------------------------------------
+# WRITE-ONLY WORKBOOKS
+# ---------------------------------------------
+def new_workbook():
+    """
+    Streaming (write_only) workbook: rows are serialized as they are
+    appended, so memory stays flat however many rows a sheet has. The link
+    style is registered once per workbook and referenced by name from every
+    hyperlink cell, instead of one Font object per cell.
+    """
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle(LINK_STYLE, font=Font(color="0000FF", underline="single")))
+    return wb
+
+
+def _with_links(ws, row):
+    row = list(row)
+    for i in LINK_INDEXES:
+        url = row[i] if i < len(row) else None
+        if url:
+            cell = WriteOnlyCell(ws, value=url)
+            cell.hyperlink = url
+            cell.style = LINK_STYLE
+            row[i] = cell
+    return row
+
+
+def write_sheet(wb, title, rows, header=COLUMNS):
+    """Append a sheet of `rows` (in COLUMNS order) with hyperlinked link columns."""
+    ws = wb.create_sheet(title=title)
+    ws.append(list(header))
+    links = list(header) == COLUMNS
+    for row in rows:
+        ws.append(_with_links(ws, row) if links else row)
+    return ws
+
+
+def copy_sheets(file_path, wb, skip=()):
+    """Stream the sheets of an existing workbook into `wb`, except those in `skip`."""
+    src = load_workbook(file_path, read_only=True)
+    try:
+        for ws in src.worksheets:
+            if ws.title in skip:
+                continue
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                # Empty default "Sheet"
+                continue
+            write_sheet(wb, ws.title, rows, header)
+    finally:
+        src.close()
+
+
+def save_workbook(wb, file_path):
+    """Save next to the target and swap it in, so a failed export never leaves half a file."""
+    folder = os.path.dirname(file_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+# ---------------------------------------------
+# SINGLE-PASS WORKBOOK BUILDER
+# ---------------------------------------------
+class WorkbookBuilder:
+    """
+    Collects the sheets of one workbook during the run, then writes the
+    whole file once in save(). Sheets from an earlier run of the same day
+    are kept unless this run replaces them. Rows are stored as plain lists,
+    so a builder pickles cheaply into an export worker. save() leaves the
+    file alone when it was last written from the same sheets.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.sheets = {}
+
+    def add_sheet(self, sheet_name, jobs):
+        self.sheets[sheet_name] = [job.as_row() for job in jobs]
+        return self
+
+    @property
+    def rows(self):
+        return sum(len(rows) for rows in self.sheets.values())
+
+    def digest(self):
+        return export_cache.content_digest(TEMPLATE_VERSION, list(self.sheets), list(self.sheets.values()))
+
+    def save(self):
+        """Write the workbook. Returns its path, or None when it was already up to date."""
+        digest = self.digest()
+        if export_cache.is_current(self.file_path, digest):
+            print(f"⏭️ Excel unchanged, kept: {self.file_path}")
+            return None
+        wb = new_workbook()
+        if os.path.exists(self.file_path):
+            copy_sheets(self.file_path, wb, skip=set(self.sheets))
+        for sheet_name, rows in self.sheets.items():
+            write_sheet(wb, sheet_name, rows)
+        save_workbook(wb, self.file_path)
+        export_cache.mark(self.file_path, digest)
+        return self.file_path
+
+
+def _save_builder(builder):
+    return builder.save()
+
+
+def save_workbooks(builders, workers=EXPORT_WORKERS):
+    """
+    Write every builder's workbook, in parallel worker processes when there
+    are several. Returns the paths written; unchanged workbooks are skipped.
+    """
+    builders = [b for b in builders if b.sheets]
+    workers = workers or os.cpu_count() or 1
+    if len(builders) <= 1 or workers <= 1:
+        saved = [b.save() for b in builders]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            saved = list(pool.map(_save_builder, builders))
+    return [file_path for file_path in saved if file_path]
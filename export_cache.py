@@ -0,0 +1,61 @@
+# export_cache.py
+
+import hashlib
+import json
+import os
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+DIGEST_SUFFIX = ".digest"       # .<artifact>.digest: what the artifact was last written from
+
+
+# ---------------------------------------------
+# CONTENT DIGESTS
+# ---------------------------------------------
+def content_digest(template_version, *parts):
+    """
+    Digest of an artifact's inputs: the template version of the writer
+    plus JSON-serializable parts (rows, records, sheet names) in order.
+    """
+    h = hashlib.blake2b(str(template_version).encode("utf-8"), digest_size=16)
+    for part in parts:
+        h.update(json.dumps(part, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def tag_path(file_path):
+    # Dot-prefixed, so it stays out of folder listings and Parquet dataset discovery
+    folder, name = os.path.split(file_path)
+    return os.path.join(folder, f".{name}{DIGEST_SUFFIX}")
+
+
+def _stat(file_path):
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def is_current(file_path, digest):
+    """
+    True when file_path was last written by mark() from inputs with this
+    digest and hasn't been touched since (same size and mtime), so it can
+    be kept as it is.
+    """
+    try:
+        with open(tag_path(file_path), encoding="utf-8") as f:
+            tag = json.load(f)
+        size, mtime_ns = _stat(file_path)
+    except (OSError, ValueError):
+        return False
+    return tag.get("digest") == digest and tag.get("size") == size and tag.get("mtime_ns") == mtime_ns
+
+
+def mark(file_path, digest):
+    """Tag a freshly written file with the digest of the inputs it was written from."""
+    size, mtime_ns = _stat(file_path)
+    path = tag_path(file_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"digest": digest, "size": size, "mtime_ns": mtime_ns}, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,102 @@
+# export_queue.py
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+EXPORT_QUEUE_SIZE = 2       # finished keyword batches waiting for export before the scraper waits
+FILE_WORKERS = None         # processes writing keyword workbooks / documents (None = CPU count)
+
+
+# ---------------------------------------------
+# BACKGROUND EXPORT WORKER
+# ---------------------------------------------
+class ExportQueue:
+    """
+    Bounded queue of export tasks run in submission order by one background
+    thread, so a finished keyword's files and DB inserts overlap the
+    scraping of the keywords still in flight. submit() waits (without
+    blocking the event loop) while `maxsize` tasks are already queued;
+    drain() waits for every queued task and stops the thread. A failing
+    task is reported and the worker carries on with the next one.
+    """
+    def __init__(self, maxsize=EXPORT_QUEUE_SIZE):
+        self.tasks = queue.Queue(maxsize)
+        self.done = 0
+        self.failed = 0
+        self.busy = 0.0         # seconds spent running tasks
+        self.waited = 0.0       # seconds submit() spent on a full queue
+        self.thread = threading.Thread(target=self._work, name="export-worker", daemon=True)
+        self.thread.start()
+
+    def _work(self):
+        while True:
+            task = self.tasks.get()
+            try:
+                if task is None:
+                    return
+                fn, args = task
+                started = time.perf_counter()
+                try:
+                    fn(*args)
+                    self.done += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"❌ Background export failed in {fn.__name__}: {e}")
+                self.busy += time.perf_counter() - started
+            finally:
+                self.tasks.task_done()
+
+    async def submit(self, fn, *args):
+        """Queue fn(*args) for the worker; waits for a free slot when the queue is full."""
+        try:
+            self.tasks.put_nowait((fn, args))
+        except queue.Full:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.tasks.put, (fn, args))
+            self.waited += time.perf_counter() - started
+
+    def drain(self):
+        """Block until every queued task has run, then stop the worker."""
+        if self.thread.is_alive():
+            self.tasks.put(None)
+            self.thread.join()
+
+    def summary(self):
+        failed = f", {self.failed} failed" if self.failed else ""
+        return (f"background export: {self.done} batches in {self.busy:.1f}s{failed}, "
+                f"scraper waited {self.waited:.1f}s on a full queue")
+
+
+# ---------------------------------------------
+# KEYWORD FILE WRITERS (process pool)
+# ---------------------------------------------
+_file_pool = None
+
+def get_file_pool():
+    global _file_pool
+    if _file_pool is None:
+        _file_pool = ProcessPoolExecutor(max_workers=FILE_WORKERS)
+    return _file_pool
+
+def shutdown_file_pool():
+    global _file_pool
+    if _file_pool is not None:
+        _file_pool.shutdown()
+        _file_pool = None
+
+def _save(builder):
+    return builder.save()
+
+def submit_save(builder):
+    """
+    Write a WorkbookBuilder or KeywordDocuments in the file pool. Returns a
+    Future of builder.save()'s result, so a released keyword's files are
+    written while later keywords are still scraping.
+    """
+    return get_file_pool().submit(_save, builder)
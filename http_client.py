@@ -0,0 +1,130 @@
+# http_client.py
+
+import httpx
+from replay import RecordingTransport, ReplayTransport
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401  (lets httpx decode "br" responses)
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30.0     # seconds an idle connection stays in the pool
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 45.0
+POOL_TIMEOUT = 60.0         # waiting for a free pooled connection
+
+# Offline runs: record live responses to an archive, or replay one without network
+RECORD_ARCHIVE = None       # e.g. "fixtures/run_20250101.zip"
+REPLAY_ARCHIVE = None
+REPLAY_LATENCY = (0.2, 0.6) # seconds per replayed response
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate",
+}
+
+
+# ---------------------------------------------
+# CONNECTION REUSE STATS
+# ---------------------------------------------
+class ConnectionStats:
+    """
+    Counts responses per pooled connection (keyed by the local socket
+    address), so we can see how many requests skipped a new TCP/TLS handshake.
+    """
+    def __init__(self):
+        self.requests = 0
+        self.per_connection = {}
+        self.http_versions = {}
+        self.compressed = 0
+
+    async def on_response(self, response):
+        self.requests += 1
+
+        stream = response.extensions.get("network_stream")
+        key = stream.get_extra_info("client_addr") if stream is not None else None
+        if key is None:
+            key = id(stream)
+        self.per_connection[key] = self.per_connection.get(key, 0) + 1
+
+        version = response.http_version
+        self.http_versions[version] = self.http_versions.get(version, 0) + 1
+        if response.headers.get("Content-Encoding"):
+            self.compressed += 1
+
+    @property
+    def connections(self):
+        return len(self.per_connection)
+
+    @property
+    def reused(self):
+        return self.requests - self.connections
+
+    def summary(self):
+        if not self.requests:
+            return "no requests sent"
+        versions = ", ".join(f"{v}: {n}" for v, n in self.http_versions.items())
+        busiest = max(self.per_connection.values())
+        return (f"{self.requests} requests over {self.connections} connection(s), "
+                f"{self.reused} reused ({self.reused / self.requests:.0%}), "
+                f"max {busiest} on one connection | {versions} | "
+                f"{self.compressed} compressed responses")
+
+
+# ---------------------------------------------
+# CLIENT FACTORY
+# ---------------------------------------------
+def create_client(**kwargs):
+    """
+    Build the tuned AsyncClient shared by every scraper entry point:
+    HTTP/2 when available, explicit pool/keep-alive limits, gzip/brotli and
+    split connect/read timeouts. Reuse stats live on client.connection_stats.
+    RECORD_ARCHIVE / REPLAY_ARCHIVE switch in the record or replay transport.
+    Extra kwargs are passed through to httpx.AsyncClient (e.g. transport=).
+    """
+    stats = ConnectionStats()
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    options = {
+        "http2": HTTP2_AVAILABLE,
+        "limits": limits,
+        "timeout": httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=POOL_TIMEOUT),
+        "headers": DEFAULT_HEADERS,
+        "event_hooks": {"response": [stats.on_response]},
+    }
+    if REPLAY_ARCHIVE:
+        options["transport"] = ReplayTransport(REPLAY_ARCHIVE, latency=REPLAY_LATENCY)
+        print(f"📼 Replaying responses from {REPLAY_ARCHIVE}")
+    elif RECORD_ARCHIVE:
+        # A custom transport ignores the client's http2/limits, so pass them on
+        inner = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits)
+        options["transport"] = RecordingTransport(RECORD_ARCHIVE, inner)
+    options.update(kwargs)
+
+    client = httpx.AsyncClient(**options)
+    client.connection_stats = stats
+    return client
+
+
+def print_connection_stats(client):
+    stats = getattr(client, "connection_stats", None)
+    if stats is not None:
+        print(f"🔌 HTTP pool: {stats.summary()}")
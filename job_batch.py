@@ -0,0 +1,319 @@
+# job_batch.py
+
+from datetime import datetime, timedelta
+
+from job_posting import JobPosting
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+# Vectorized (numpy) page filtering. Per-call numpy overhead only pays off
+# from roughly 1000 cards per batch, so the 25-card search pages default to
+# the scalar filter.
+COLUMNAR_FILTER = False
+MAX_AGE_DAYS = 7            # keep jobs posted within the last N days
+TITLE_EXCLUDE_TERMS = []    # case-insensitive title substrings to drop, e.g. ["senior", "lead"]
+
+
+# ---------------------------------------------
+# COLUMNAR BATCH (one page / keyword of cards)
+# ---------------------------------------------
+class JobBatch:
+    """
+    Extractor records held as parallel numpy columns (job ids as int64,
+    text fields as fixed-width unicode), so page filters run as array ops
+    instead of a Python loop per card.
+    """
+    __slots__ = ("keyword", "job_id", "title", "company", "location", "date_posted", "job_link")
+
+    def __init__(self, keyword, job_id, title, company, location, date_posted, job_link):
+        self.keyword = keyword
+        self.job_id = job_id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.date_posted = date_posted
+        self.job_link = job_link
+
+    @classmethod
+    def from_records(cls, records, keyword):
+        return cls(
+            keyword,
+            np.fromiter((int(r["job_id"]) for r in records), dtype=np.int64, count=len(records)),
+            np.array([r["title"] for r in records], dtype=str),
+            np.array([r["company"] for r in records], dtype=str),
+            np.array([r["location"] for r in records], dtype=str),
+            np.array([r["date_posted"] for r in records], dtype=str),
+            np.array([r["job_link"] for r in records], dtype=str),
+        )
+
+    def __len__(self):
+        return len(self.job_id)
+
+    def take(self, mask):
+        return JobBatch(self.keyword, self.job_id[mask], self.title[mask], self.company[mask],
+                        self.location[mask], self.date_posted[mask], self.job_link[mask])
+
+    # ---- masks ----
+    def first_occurrence(self):
+        """True for the first card of each job id within the batch."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[np.unique(self.job_id, return_index=True)[1]] = True
+        return mask
+
+    def posted_since(self, cutoff):
+        """True where date_posted parses and is at or after `cutoff` (datetime64)."""
+        dates = np.char.replace(self.date_posted, "Z", "")
+        try:
+            posted = dates.astype("datetime64[s]")
+        except ValueError:
+            # A malformed date somewhere in the page: parse one by one, NaT for the bad ones
+            posted = np.array([_parse_date(d) for d in dates.tolist()], dtype="datetime64[s]")
+        return posted >= cutoff
+
+    def title_matches(self, terms):
+        titles = np.char.lower(self.title)
+        mask = np.zeros(len(self), dtype=bool)
+        for term in terms:
+            mask |= np.char.find(titles, term.lower()) >= 0
+        return mask
+
+    def after(self, mark):
+        """True for cards strictly newer than mark = (posted, job_id)."""
+        posted, job_id = mark
+        return (self.date_posted > posted) | ((self.date_posted == posted) & (self.job_id > job_id))
+
+    def newest(self):
+        """Largest (posted, job_id) in the batch, or None when empty."""
+        if not len(self):
+            return None
+        i = np.lexsort((self.job_id, self.date_posted))[-1]
+        return str(self.date_posted[i]), int(self.job_id[i])
+
+    # ---- sink ----
+    def to_postings(self):
+        """JobPosting objects; every export (Excel, documents, Parquet, DB) reads these."""
+        return [JobPosting(*fields, self.keyword, link) for *fields, link in zip(
+            self.job_id.tolist(), self.title.tolist(), self.company.tolist(),
+            self.location.tolist(), self.date_posted.tolist(), self.job_link.tolist())]
+
+
+def _parse_date(date_str):
+    try:
+        return datetime.fromisoformat(date_str).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+class IdSet:
+    """Growing set of int64 job ids, stored as one sorted array."""
+    def __init__(self, ids=()):
+        self.ids = np.unique(np.fromiter((int(i) for i in ids), dtype=np.int64))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def contains(self, ids):
+        pos = np.searchsorted(self.ids, ids)
+        pos[pos == len(self.ids)] = 0
+        return (self.ids[pos] == ids) if len(self.ids) else np.zeros(len(ids), dtype=bool)
+
+    def add(self, ids):
+        # Insert in place of a full re-sort: one O(n) copy per page
+        new = np.unique(ids[~self.contains(ids)])
+        if len(new):
+            self.ids = np.insert(self.ids, np.searchsorted(self.ids, new), new)
+
+
+# ---------------------------------------------
+# PAGE FILTERS (dedupe + date window + title terms)
+# ---------------------------------------------
+class PageFilter:
+    """
+    Per-keyword filter applied to every search page. apply() returns the
+    kept JobPostings, how many ids were new to the (sub-)query and whether
+    paging can stop: every card is at or behind the watermark and none of
+    them would be kept today (all known from earlier days, or outside the
+    date / title filters), so a same-day re-run still walks the day's pages.
+    self.newest tracks the newest (posted, job_id) seen, for the watermark.
+    Job ids seen earlier today or on previous days are skipped, then jobs
+    outside the date window or matching an excluded title term are dropped.
+    With a shared RunDedupe, a job another keyword already kept is only
+    tagged with this keyword instead of being kept twice.
+    """
+    def __init__(self, keyword, seen_before, watermark=None, max_age_days=MAX_AGE_DAYS,
+                 exclude_terms=TITLE_EXCLUDE_TERMS, run_dedupe=None):
+        self.keyword = keyword
+        self.watermark = watermark
+        self.run_dedupe = run_dedupe
+        self.exclude_terms = list(exclude_terms)
+        self.newest = None
+        # One "now" per run instead of one per card
+        self.cutoff = datetime.now() - timedelta(days=max_age_days)
+        self.seen = self._id_set(seen_before)
+
+    def query_ids(self):
+        """Fresh id set for one (sub-)query, passed back into apply()."""
+        return self._id_set(())
+
+    def _advance_newest(self, mark):
+        if mark is not None and (self.newest is None or mark > self.newest):
+            self.newest = mark
+
+    def _claimed(self, job_id):
+        return self.run_dedupe is not None and self.run_dedupe.tag(job_id, self.keyword)
+
+    def _keep(self, postings):
+        if self.run_dedupe is not None:
+            for job in postings:
+                self.run_dedupe.add(job)
+        return postings
+
+
+class ColumnarPageFilter(PageFilter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cutoff = np.datetime64(self.cutoff, "s")
+
+    @staticmethod
+    def _id_set(ids):
+        return IdSet(ids)
+
+    def apply(self, records, query_ids):
+        batch = JobBatch.from_records(records, self.keyword)
+        first = batch.first_occurrence()
+
+        new_in_page = int(np.count_nonzero(first & ~query_ids.contains(batch.job_id)))
+        query_ids.add(batch.job_id)
+
+        self._advance_newest(batch.newest())
+
+        unseen = first & ~self.seen.contains(batch.job_id)
+        self.seen.add(batch.job_id[unseen])
+
+        keep = unseen & batch.posted_since(self.cutoff)
+        if self.exclude_terms:
+            keep &= ~batch.title_matches(self.exclude_terms)
+        page_behind = (self.watermark is not None and not batch.after(self.watermark).any()
+                       and not keep.any())
+        if self.run_dedupe is not None:
+            keep[keep] = [not self._claimed(job_id) for job_id in batch.job_id[keep].tolist()]
+        return self._keep(batch.take(keep).to_postings()), new_in_page, page_behind
+
+
+class ScalarPageFilter(PageFilter):
+    """Same rules card by card, for installs without numpy."""
+    @staticmethod
+    def _id_set(ids):
+        return {int(i) for i in ids}
+
+    def apply(self, records, query_ids):
+        kept = []
+        new_in_page = 0
+        page_behind = True
+        terms = [t.lower() for t in self.exclude_terms]
+        for card in records:
+            job_id = int(card["job_id"])
+            date_posted = card["date_posted"]
+
+            if job_id not in query_ids:
+                query_ids.add(job_id)
+                new_in_page += 1
+
+            mark = (date_posted, job_id)
+            self._advance_newest(mark)
+            if self.watermark is None or mark > self.watermark:
+                page_behind = False
+
+            if job_id in self.seen:
+                continue
+            self.seen.add(job_id)
+
+            posted = _parse_date(date_posted.replace("Z", ""))
+            if posted is None or posted < self.cutoff:
+                continue
+            if terms and any(t in card["title"].lower() for t in terms):
+                continue
+            # A card kept today means the page isn't fully known yet
+            page_behind = False
+            if self._claimed(job_id):
+                continue
+
+            kept.append(JobPosting.from_record(card, self.keyword))
+        return self._keep(kept), new_in_page, page_behind and self.watermark is not None
+
+
+def make_page_filter(keyword, seen_before, watermark=None, run_dedupe=None):
+    if COLUMNAR_FILTER and np is not None:
+        return ColumnarPageFilter(keyword, seen_before, watermark, run_dedupe=run_dedupe)
+    return ScalarPageFilter(keyword, seen_before, watermark, run_dedupe=run_dedupe)
+
+
+# ---------------------------------------------
+# RUN-WIDE DEDUPE (shared by every keyword task)
+# ---------------------------------------------
+class RunDedupe:
+    """
+    Every job kept in this run, by id. The first keyword to keep a job
+    creates its JobPosting; later keywords only add themselves to the job's
+    matched keywords, so the job is exported, inserted and messaged once.
+    """
+    def __init__(self):
+        self.jobs = {}
+        self.matched = {}       # job_id -> every keyword that matched it so far
+
+    def tag(self, job_id, keyword):
+        """True if another keyword already kept job_id (and now lists `keyword` too)."""
+        keywords = self.matched.get(job_id)
+        if keywords is None:
+            return False
+        if keyword not in keywords:
+            keywords.append(keyword)
+        return True
+
+    def add(self, job):
+        self.jobs[job.job_id] = job
+        self.matched[job.job_id] = job.keywords
+
+    def owned_by(self, keyword, keywords):
+        """
+        Jobs owned by `keyword`: the first of their keywords in `keywords`
+        order, so ownership doesn't depend on which task won the race. Final
+        once `keyword` and every keyword before it have finished scraping.
+        Returned newest first (posted date, then job id, as the search sorts
+        them), so the order doesn't depend on which task saw a job first.
+        Released jobs are labelled with `keyword` only: the keywords before
+        it are done and didn't match, while the ones after it may still be
+        scraping, so that is the only label that is the same on every run.
+        settle() adds the rest once every keyword has finished.
+        """
+        rank = {kw: i for i, kw in enumerate(keywords)}
+        owned = []
+        for job_id, matched in self.matched.items():
+            if keyword in matched:
+                matched.sort(key=lambda kw: rank.get(kw, len(rank)))
+                if matched[0] == keyword:
+                    job = self.jobs[job_id]
+                    job.keywords = [keyword]
+                    owned.append(job)
+        owned.sort(key=lambda job: (job.date_posted or "", job.job_id), reverse=True)
+        return owned
+
+    def settle(self, jobs):
+        """
+        Give released jobs every keyword that matched them in the run. Only
+        call once every keyword has finished scraping and nothing is still
+        reading the jobs.
+        """
+        for job in jobs:
+            job.keywords = list(self.matched[job.job_id])
+        return jobs
+
+    def summary(self):
+        shared = sum(1 for keywords in self.matched.values() if len(keywords) > 1)
+        return f"{len(self.jobs)} unique jobs, {shared} matched more than one keyword"
@@ -0,0 +1,244 @@
+# job_extractor.py
+
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+EXTRACTOR_BACKEND = "lxml"  # "lxml", "selectolax" or "bs4" (falls back to bs4 if not installed)
+PAGE_ENCODING = "utf-8"     # guest-search fragments carry no charset declaration; lxml would assume Latin-1
+
+JOB_ID_RE = re.compile(r"/jobs/view/.*?-(\d+)")
+LOCATION_CLASS = "job-search-card__location"
+
+
+def mobile_link(job_id):
+    return f"https://www.linkedin.com/jobs/view/{job_id}"
+
+
+# ---------------------------------------------
+# COMMON INTERFACE
+# ---------------------------------------------
+class BaseExtractor:
+    """
+    Turns one search page into plain dict records:
+    job_id, title, company, location, date_posted, job_link.
+    Cards missing any field are skipped.
+    """
+    name = "base"
+
+    def extract(self, content):
+        raise NotImplementedError
+
+    @staticmethod
+    def _record(title, company, location, date_posted, job_link):
+        job_id_match = JOB_ID_RE.search(job_link)
+        if not job_id_match:
+            return None
+        return {
+            "job_id": job_id_match.group(1),
+            "title": title.strip(),
+            "company": company.strip(),
+            "location": location.strip(),
+            "date_posted": date_posted,
+            "job_link": job_link,
+        }
+
+
+# ---------------------------------------------
+# BEAUTIFULSOUP (reference / fallback)
+# ---------------------------------------------
+class SoupExtractor(BaseExtractor):
+    name = "bs4"
+
+    def extract(self, content):
+        records = []
+        for job in BeautifulSoup(content, "lxml").select("li"):
+            try:
+                title_tag = job.find("h3")
+                company_tag = job.find("h4")
+                location_tag = job.find("span", class_=LOCATION_CLASS)
+                time_tag = job.find("time")
+                link_tag = job.find("a", href=True)
+
+                if not all([title_tag, company_tag, location_tag, time_tag, link_tag]):
+                    continue
+
+                record = self._record(title_tag.text, company_tag.text, location_tag.text,
+                                      time_tag.get("datetime", ""), link_tag["href"])
+                if record:
+                    records.append(record)
+
+            except Exception as e:
+                print(f"⚠️ Parse Error: {e}")
+                continue
+        return records
+
+
+# ---------------------------------------------
+# LXML (single walk per card)
+# ---------------------------------------------
+class LxmlExtractor(BaseExtractor):
+    name = "lxml"
+
+    _cards = etree.XPath("//li") if etree is not None else None
+
+    def extract(self, content):
+        if not content or not content.strip():
+            return []
+        # A parser per call: the parse pool may run extract() on several threads at once
+        root = etree.HTML(content, etree.HTMLParser(encoding=PAGE_ENCODING))
+        if root is None:
+            return []
+
+        records = []
+        for job in self._cards(root):
+            try:
+                record = self.extract_card(job)
+                if record:
+                    records.append(record)
+            except Exception as e:
+                print(f"⚠️ Parse Error: {e}")
+                continue
+        return records
+
+    def extract_card(self, job):
+        title = company = location = time_el = href = None
+
+        # One walk over the card, keeping the first match of each field
+        for el in job.iterdescendants():
+            tag = el.tag
+            if tag == "h3":
+                if title is None:
+                    title = el
+            elif tag == "h4":
+                if company is None:
+                    company = el
+            elif tag == "span":
+                if location is None and LOCATION_CLASS in (el.get("class") or "").split():
+                    location = el
+            elif tag == "time":
+                if time_el is None:
+                    time_el = el
+            elif tag == "a":
+                if href is None:
+                    href = el.get("href")
+
+        if title is None or company is None or location is None or time_el is None or href is None:
+            return None
+
+        return self._record("".join(title.itertext()), "".join(company.itertext()),
+                            "".join(location.itertext()), time_el.get("datetime", ""), href)
+
+
+# ---------------------------------------------
+# STREAMING (lxml feed parser)
+# ---------------------------------------------
+class StreamingCardParser:
+    """
+    Incremental parser for one search page: feed() raw chunks as they
+    arrive and get back the records of every <li> that closed in them.
+    Finished cards are cleared right away, so the page tree never builds up.
+    Chunks are decoded as `encoding` (the response charset, when it has one).
+    """
+    def __init__(self, encoding=None):
+        self.parser = etree.HTMLPullParser(events=("end",), tag="li", encoding=encoding or PAGE_ENCODING)
+        self.extractor = LxmlExtractor()
+        self.cards = 0
+
+    def _drain(self):
+        records = []
+        for _, job in self.parser.read_events():
+            self.cards += 1
+            try:
+                record = self.extractor.extract_card(job)
+                if record:
+                    records.append(record)
+            except Exception as e:
+                print(f"⚠️ Parse Error: {e}")
+            job.clear(keep_tail=True)
+            parent = job.getparent()
+            while parent is not None and job.getprevious() is not None:
+                del parent[0]
+        return records
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+        return self._drain()
+
+    def close(self):
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            # Empty page: nothing was ever fed
+            pass
+        return self._drain()
+
+
+# ---------------------------------------------
+# SELECTOLAX (lexbor, optional)
+# ---------------------------------------------
+class SelectolaxExtractor(BaseExtractor):
+    name = "selectolax"
+
+    def extract(self, content):
+        records = []
+        for job in LexborHTMLParser(content).css("li"):
+            try:
+                title_tag = job.css_first("h3")
+                company_tag = job.css_first("h4")
+                location_tag = job.css_first(f"span.{LOCATION_CLASS}")
+                time_tag = job.css_first("time")
+                link_tag = job.css_first("a[href]")
+
+                if not all([title_tag, company_tag, location_tag, time_tag, link_tag]):
+                    continue
+
+                record = self._record(title_tag.text(), company_tag.text(), location_tag.text(),
+                                      time_tag.attributes.get("datetime") or "",
+                                      link_tag.attributes.get("href") or "")
+                if record:
+                    records.append(record)
+
+            except Exception as e:
+                print(f"⚠️ Parse Error: {e}")
+                continue
+        return records
+
+
+# ---------------------------------------------
+# BACKEND REGISTRY
+# ---------------------------------------------
+BACKENDS = {"bs4": SoupExtractor}
+if etree is not None:
+    BACKENDS["lxml"] = LxmlExtractor
+if LexborHTMLParser is not None:
+    BACKENDS["selectolax"] = SelectolaxExtractor
+
+_extractors = {}
+
+def get_extractor(name=None):
+    name = name or EXTRACTOR_BACKEND
+    if name not in BACKENDS:
+        print(f"⚠️ Extractor backend '{name}' not available, using bs4")
+        name = "bs4"
+    if name not in _extractors:
+        _extractors[name] = BACKENDS[name]()
+    return _extractors[name]
+
+
+def extract_job_cards(content):
+    """Module-level entry point (picklable for the parse pool)."""
+    return get_extractor().extract(content)
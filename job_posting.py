@@ -0,0 +1,56 @@
+# job_posting.py
+
+from job_extractor import mobile_link
+
+# Column order of every Excel / CSV export
+COLUMNS = ["Title", "Company", "Location", "Date Posted", "Keyword", "Job Link", "Mobile Link"]
+
+
+class JobPosting:
+    """
+    One scraped job. __slots__ keeps the per-job footprint small (no
+    instance __dict__); the job id is stored as an int and the mobile link is
+    derived from it on demand instead of being stored.
+    `keywords` lists every search keyword that matched the job in this run;
+    the first one owns it (its sheet / run log). `repost_of` is the job id of
+    an earlier near-identical posting, when repost detection flags one.
+    """
+    __slots__ = ("job_id", "title", "company", "location", "date_posted", "keywords", "job_link",
+                 "repost_of")
+
+    def __init__(self, job_id, title, company, location, date_posted, keyword, job_link):
+        self.job_id = int(job_id)
+        self.title = title
+        self.company = company
+        self.location = location
+        self.date_posted = date_posted
+        self.keywords = [keyword]
+        self.job_link = job_link
+        self.repost_of = None
+
+    @classmethod
+    def from_record(cls, record, keyword):
+        """Build from an extractor record (see job_extractor.BaseExtractor)."""
+        return cls(record["job_id"], record["title"], record["company"], record["location"],
+                   record["date_posted"], keyword, record["job_link"])
+
+    @property
+    def keyword(self):
+        return self.keywords[0]
+
+    @property
+    def keyword_label(self):
+        """All matched keywords, as stored in the Keyword column."""
+        return ", ".join(self.keywords)
+
+    @property
+    def mobile_link(self):
+        return mobile_link(self.job_id)
+
+    def as_row(self):
+        """Values in COLUMNS order."""
+        return [self.title, self.company, self.location, self.date_posted,
+                self.keyword_label, self.job_link, self.mobile_link]
+
+    def __repr__(self):
+        return f"JobPosting({self.job_id}, {self.title!r}, {self.company!r}, {self.keywords!r})"
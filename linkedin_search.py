@@ -0,0 +1,193 @@
+# linkedin_search.py
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import httpx
+from job_extractor import StreamingCardParser, extract_job_cards
+from rate_limiter import get_limiter
+from response_cache import get_response_cache
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+SEARCH_HOST = httpx.URL(SEARCH_URL).host
+PAGE_SIZE = 25
+DEFAULT_TIME_WINDOW = "r86400"     # f_TPR: posted in the last 24 hours
+PARSE_POOL = "process"      # "process", "thread" or None (parse on the event loop)
+PARSE_WORKERS = None        # None = executor default (CPU count)
+STREAM_PARSE = False        # parse cards while the body downloads (lxml only, bypasses the parse pool)
+
+
+class SearchAborted(Exception):
+    pass
+
+
+# ---------------------------------------------
+# SEARCH PARAMS
+# ---------------------------------------------
+def search_params(keyword, location, page, time_window=DEFAULT_TIME_WINDOW):
+    return {
+        "keywords": keyword,
+        "location": location,
+        "sortBy": "R",          # Most recent
+        "f_TPR": time_window,
+        "start": page * PAGE_SIZE
+    }
+
+
+# ---------------------------------------------
+# PARSE POOL (keeps CPU-bound parsing off the event loop)
+# ---------------------------------------------
+_parse_pool = None
+
+def get_parse_pool():
+    global _parse_pool
+    if _parse_pool is None and PARSE_POOL:
+        if PARSE_POOL == "process":
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+    return _parse_pool
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
+        _parse_pool = None
+
+async def run_parse(parse, content):
+    pool = get_parse_pool()
+    if pool is None:
+        return parse(content)
+    return await asyncio.get_running_loop().run_in_executor(pool, parse, content)
+
+
+# ---------------------------------------------
+# FETCH ONE PAGE (cache + shared limiter + retry handling)
+# ---------------------------------------------
+async def fetch_search_page(client, keyword, location, page, max_retry=3, time_window=DEFAULT_TIME_WINDOW,
+                            stream=False):
+    """
+    Fetch a single search page, paced by the host's shared rate limiter.
+    Fresh pages are served from the on-disk response cache without touching
+    the network. Returns the raw HTML bytes, or None once the page failed more
+    than max_retry times. While the host's circuit is open, the limiter holds the request back.
+
+    With stream=True the body is read chunk by chunk and fed to a
+    StreamingCardParser as it arrives; the parsed card records are returned
+    instead of the bytes, and the body goes to the cache file chunk by chunk.
+    """
+    params = search_params(keyword, location, page, time_window)
+    cache = get_response_cache()
+    cached = cache.get(SEARCH_URL, params)
+    if cached is not None:
+        print(f"💾 [{keyword}] Page {page} served from cache")
+        if stream:
+            parser = StreamingCardParser()
+            return parser.feed(cached) + parser.close()
+        return cached
+
+    limiter = get_limiter(SEARCH_HOST)
+    retry = 0
+    while True:
+        await limiter.acquire()
+        print(f"🔄 [{keyword}] Fetching page {page}...")
+        try:
+            if stream:
+                async with client.stream("GET", SEARCH_URL, params=params) as resp:
+                    if resp.status_code == 200:
+                        cards = await _stream_cards(resp, cache.writer(SEARCH_URL, params))
+            else:
+                resp = await client.get(SEARCH_URL, params=params)
+        except httpx.TransportError:
+            limiter.on_failure()
+            raise
+
+        if resp.status_code == 429:
+            wait_time = limiter.on_rate_limited(resp.headers.get("Retry-After"))
+            print(f"🚫 Rate limited (429). Backing off {wait_time:.0f} sec, "
+                  f"rate now {limiter.rate:.2f} req/s...")
+            continue
+
+        if resp.status_code != 200:
+            print(f"❌ [{keyword}] HTTP {resp.status_code} on page {page}")
+            limiter.on_failure()
+            retry += 1
+            if retry > max_retry:
+                return None
+            continue
+
+        limiter.on_success()
+        if stream:
+            return cards
+        cache.put(SEARCH_URL, params, resp.content)
+        return resp.content
+
+
+async def _stream_cards(resp, cache_writer):
+    """Feed a streamed 200 body to the incremental parser (and the cache)."""
+    parser = StreamingCardParser(resp.charset_encoding)
+    cards = []
+    try:
+        async for chunk in resp.aiter_bytes():
+            if cache_writer is not None:
+                cache_writer.write(chunk)
+            cards.extend(parser.feed(chunk))
+        cards.extend(parser.close())
+    except BaseException:
+        if cache_writer is not None:
+            cache_writer.discard()
+        raise
+    if cache_writer is not None:
+        cache_writer.commit()
+    return cards
+
+
+# ---------------------------------------------
+# PIPELINED PAGE ITERATOR
+# ---------------------------------------------
+async def iter_search_pages(client, keyword, location, parse=extract_job_cards, prefetch=3, max_retry=3,
+                            time_window=DEFAULT_TIME_WINDOW):
+    """
+    Yield (page, cards) for every search page of a keyword, in page order.
+
+    Up to `prefetch` page requests are kept in flight while earlier pages are
+    parsed in the parse pool; the shared rate limiter decides when each one
+    actually goes out. `parse` must be a module-level function when
+    PARSE_POOL is "process". With STREAM_PARSE each page is instead parsed
+    incrementally while it downloads and `parse` is not used.
+    Iteration ends normally at the first empty page; a page that kept failing
+    raises SearchAborted (an open circuit only delays requests). Either way
+    the requests still outstanding are cancelled.
+    """
+    pending = {}
+    next_page = 0
+    page = 0
+    try:
+        while True:
+            while len(pending) < max(1, prefetch):
+                pending[next_page] = asyncio.ensure_future(
+                    fetch_search_page(client, keyword, location, next_page, max_retry, time_window,
+                                      stream=STREAM_PARSE)
+                )
+                next_page += 1
+
+            result = await pending.pop(page)
+            if result is None:
+                raise SearchAborted(f"too many failures on page {page} of '{keyword}'")
+
+            cards = result if STREAM_PARSE else await run_parse(parse, result)
+            if not cards:
+                print(f"ℹ️ No more jobs found for: {keyword}")
+                return
+
+            yield page, cards
+            page += 1
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            print(f"✂️ [{keyword}] Cancelled {len(pending)} prefetched page request(s)")
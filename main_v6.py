@@ -7,10 +7,12 @@ import asyncio
 import httpx
 from bs4 import BeautifulSoup
 import re
-import random
 import os
 from datetime import datetime, timedelta
 from openpyxl import Workbook, load_workbook
+from rate_limiter import get_limiter
+from http_client import create_client, print_connection_stats
+from job_posting import COLUMNS, JobPosting
 
 # ---------------------------------------------
 # CONFIG
@@ -30,26 +32,22 @@ def posted_within_last_week(date_str):
         return False
 
 # ---------------------------------------------
-# CLEAN JOB ID → Mobile Link
+# ROW LAYOUT (Job ID first, used to dedupe appends)
 # ---------------------------------------------
-def get_mobile_link(job_link):
-    match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-    return f"https://www.linkedin.com/jobs/view/{match.group(1)}" if match else job_link
+def job_row(job):
+    return [str(job.job_id)] + job.as_row()
 
 # ---------------------------------------------
 # SCRAPE PER KEYWORD
 # ---------------------------------------------
 async def fetch_jobs_for_keyword(client, keyword):
     url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-    }
 
     job_postings = []
     seen_ids_today = set()
 
     print(f"\n🚀 Starting scrape for keyword: {keyword}")
+    limiter = get_limiter(httpx.URL(url).host)
     page = 0
     retry = 0
 
@@ -65,25 +63,26 @@ async def fetch_jobs_for_keyword(client, keyword):
         print(f"🔄 Fetching page {page}...")
 
         try:
-            resp = await client.get(url, headers=headers, params=params)
+            await limiter.acquire()
+            resp = await client.get(url, params=params)
 
             # RATE LIMIT
             if resp.status_code == 429:
-                wait_time = random.randint(45, 90)
-                print(f"🚫 Rate limited (429). Sleeping {wait_time} sec...")
-                await asyncio.sleep(wait_time)
+                wait_time = limiter.on_rate_limited(resp.headers.get("Retry-After"))
+                print(f"🚫 Rate limited (429). Backing off {wait_time:.0f} sec...")
                 continue
 
             # OTHER ERRORS
             if resp.status_code != 200:
                 print(f"❌ HTTP {resp.status_code} on page {page}")
+                limiter.on_failure()
                 retry += 1
                 if retry > MAX_RETRY:
                     print("❌ Too many failures. Stopping scraper.")
                     break
-                await asyncio.sleep(5)
                 continue
 
+            limiter.on_success()
             retry = 0
             from bs4 import BeautifulSoup
             soup = BeautifulSoup(resp.content, "lxml")
@@ -107,7 +106,6 @@ async def fetch_jobs_for_keyword(client, keyword):
                         continue
 
                     job_link = link_tag["href"]
-                    mobile_link = get_mobile_link(job_link)
 
                     job_id_match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
                     if not job_id_match:
@@ -126,23 +124,13 @@ async def fetch_jobs_for_keyword(client, keyword):
                     if not posted_within_last_week(date_posted):
                         continue
 
-                    job_postings.append({
-                        "Job ID": job_id,
-                        "Title": title,
-                        "Company": company,
-                        "Location": location,
-                        "Date Posted": date_posted,
-                        "Keyword": keyword,
-                        "Job Link": job_link,
-                        "Mobile Link": mobile_link
-                    })
+                    job_postings.append(JobPosting(job_id, title, company, location,
+                                                   date_posted, keyword, job_link))
 
                 except Exception as e:
                     print(f"⚠️ Parse Error: {e}")
                     continue
 
-            await asyncio.sleep(random.uniform(1.5, 3.5))
-
         except Exception as e:
             print(f"⚠️ Fatal Error: {e}")
             break
@@ -176,7 +164,7 @@ async def main():
         ws_default = wb["Sheet"]
         wb.remove(ws_default)
 
-    async with httpx.AsyncClient(timeout=45.0) as client:
+    async with create_client() as client:
         for keyword in KEYWORDS:
             jobs = await fetch_jobs_for_keyword(client, keyword)
             if not jobs:
@@ -193,18 +181,17 @@ async def main():
                     existing_ids.add(str(row[0]))
             else:
                 ws = wb.create_sheet(title=sheet_name)
-                ws.append(["Job ID", "Title", "Company", "Location", "Date Posted",
-                           "Keyword", "Job Link", "Mobile Link"])
+                ws.append(["Job ID"] + COLUMNS)
                 existing_ids = set()
 
             # Append new jobs, skip duplicates
             new_count = 0
             for job in jobs:
-                if job["Job ID"] in existing_ids:
+                row = job_row(job)
+                if row[0] in existing_ids:
                     continue
-                ws.append([job["Job ID"], job["Title"], job["Company"], job["Location"],
-                           job["Date Posted"], job["Keyword"], job["Job Link"], job["Mobile Link"]])
-                existing_ids.add(job["Job ID"])
+                ws.append(row)
+                existing_ids.add(row[0])
                 new_count += 1
 
             print(f"📝 {new_count} new jobs added to sheet '{sheet_name}'.")
@@ -214,14 +201,16 @@ async def main():
             print(f"📢 RESULTS FOR {keyword}")
             print("========================\n")
             for job in jobs:
-                print("🧾 Title   :", job["Title"])
-                print("🏢 Company :", job["Company"])
-                print("📍 Location:", job["Location"])
-                print("📅 Posted  :", job["Date Posted"])
-                print("🔑 Keyword :", job["Keyword"])
-                print("🔗 Link    :", job["Mobile Link"])
+                print("🧾 Title   :", job.title)
+                print("🏢 Company :", job.company)
+                print("📍 Location:", job.location)
+                print("📅 Posted  :", job.date_posted)
+                print("🔑 Keyword :", job.keyword_label)
+                print("🔗 Link    :", job.mobile_link)
                 print("-" * 80)
 
+        print_connection_stats(client)
+
     # Save workbook
     wb.save(excel_file)
     print(f"\n🎉 Excel saved: {excel_file}")
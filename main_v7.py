@@ -7,11 +7,13 @@ import asyncio
 import httpx
 from bs4 import BeautifulSoup
 import re
-import random
 import os
 from datetime import datetime, timedelta
 from openpyxl import Workbook, load_workbook
-import csv
+from rate_limiter import get_limiter
+from http_client import create_client, print_connection_stats
+from job_posting import COLUMNS, JobPosting
+from csv_sink import StreamingCsvSink
 
 # ---------------------------------------------
 # CONFIG
@@ -19,6 +21,8 @@ import csv
 KEYWORDS = ["Java Full Stack Developer", "C# Software Engineer"]
 LOCATION = "United States"
 MAX_RETRY = 3
+CSV_GZIP = False            # write the daily CSV as .csv.gz
+CSV_FIELDS = ["Job ID"] + COLUMNS
 
 # ---------------------------------------------
 # DATE FILTER (Last 7 days)
@@ -31,26 +35,22 @@ def posted_within_last_week(date_str):
         return False
 
 # ---------------------------------------------
-# CLEAN JOB ID → Mobile Link
+# ROW LAYOUT (Job ID first, used to dedupe appends)
 # ---------------------------------------------
-def get_mobile_link(job_link):
-    match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-    return f"https://www.linkedin.com/jobs/view/{match.group(1)}" if match else job_link
+def job_row(job):
+    return [str(job.job_id)] + job.as_row()
 
 # ---------------------------------------------
 # SCRAPE PER KEYWORD
 # ---------------------------------------------
-async def fetch_jobs_for_keyword(client, keyword):
+async def fetch_jobs_for_keyword(client, keyword, csv_sink=None):
     url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-    }
 
     job_postings = []
     seen_ids_today = set()
 
     print(f"\n🚀 Starting scrape for keyword: {keyword}")
+    limiter = get_limiter(httpx.URL(url).host)
     page = 0
     retry = 0
 
@@ -66,23 +66,24 @@ async def fetch_jobs_for_keyword(client, keyword):
         print(f"🔄 Fetching page {page}...")
 
         try:
-            resp = await client.get(url, headers=headers, params=params)
+            await limiter.acquire()
+            resp = await client.get(url, params=params)
 
             if resp.status_code == 429:
-                wait_time = random.randint(45, 90)
-                print(f"🚫 Rate limited (429). Sleeping {wait_time} sec...")
-                await asyncio.sleep(wait_time)
+                wait_time = limiter.on_rate_limited(resp.headers.get("Retry-After"))
+                print(f"🚫 Rate limited (429). Backing off {wait_time:.0f} sec...")
                 continue
 
             if resp.status_code != 200:
                 print(f"❌ HTTP {resp.status_code} on page {page}")
+                limiter.on_failure()
                 retry += 1
                 if retry > MAX_RETRY:
                     print("❌ Too many failures. Stopping scraper.")
                     break
-                await asyncio.sleep(5)
                 continue
 
+            limiter.on_success()
             retry = 0
             soup = BeautifulSoup(resp.content, "lxml")
             job_cards = soup.select("li")
@@ -93,6 +94,7 @@ async def fetch_jobs_for_keyword(client, keyword):
 
             page += 1
 
+            page_jobs = []
             for job in job_cards:
                 try:
                     title_tag = job.find("h3")
@@ -105,7 +107,6 @@ async def fetch_jobs_for_keyword(client, keyword):
                         continue
 
                     job_link = link_tag["href"]
-                    mobile_link = get_mobile_link(job_link)
 
                     job_id_match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
                     if not job_id_match:
@@ -124,22 +125,17 @@ async def fetch_jobs_for_keyword(client, keyword):
                     if not posted_within_last_week(date_posted):
                         continue
 
-                    job_postings.append({
-                        "Job ID": job_id,
-                        "Title": title,
-                        "Company": company,
-                        "Location": location,
-                        "Date Posted": date_posted,
-                        "Keyword": keyword,
-                        "Job Link": job_link,
-                        "Mobile Link": mobile_link
-                    })
+                    page_jobs.append(JobPosting(job_id, title, company, location,
+                                                date_posted, keyword, job_link))
 
                 except Exception as e:
                     print(f"⚠️ Parse Error: {e}")
                     continue
 
-            await asyncio.sleep(random.uniform(1.5, 3.5))
+            # Stream the page to the daily CSV right away, so it survives a crash later on
+            job_postings.extend(page_jobs)
+            if csv_sink is not None:
+                csv_sink.write_rows([job_row(job) for job in page_jobs])
 
         except Exception as e:
             print(f"⚠️ Fatal Error: {e}")
@@ -155,23 +151,13 @@ def clean_sheet_name(name):
     return re.sub(r"[\\/*?:\[\]]", "", name.replace(" ", "_"))
 
 # ---------------------------------------------
-# SAVE DAILY CSV FOR KEYWORD
+# DAILY CSV FOR KEYWORD (streamed page by page)
 # ---------------------------------------------
-def save_daily_csv(keyword, jobs):
+def open_daily_csv(keyword):
     folder_name = clean_sheet_name(keyword)
-    os.makedirs(folder_name, exist_ok=True)
     date_code = datetime.now().strftime("%Y%m%d")
     csv_file = os.path.join(folder_name, f"LinkedIn_{folder_name}_Jobs_{date_code}.csv")
-
-    with open(csv_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "Job ID", "Title", "Company", "Location",
-            "Date Posted", "Keyword", "Job Link", "Mobile Link"
-        ])
-        writer.writeheader()
-        writer.writerows(jobs)
-
-    print(f"📁 CSV saved for {keyword}: {csv_file}")
+    return StreamingCsvSink(csv_file, CSV_FIELDS, compress=CSV_GZIP)
 
 # ---------------------------------------------
 # MAIN
@@ -190,9 +176,11 @@ async def main():
     if "Sheet" in wb.sheetnames and len(wb.sheetnames) == 1:
         wb.remove(wb["Sheet"])
 
-    async with httpx.AsyncClient(timeout=45.0) as client:
+    async with create_client() as client:
         for keyword in KEYWORDS:
-            jobs = await fetch_jobs_for_keyword(client, keyword)
+            with open_daily_csv(keyword) as csv_sink:
+                jobs = await fetch_jobs_for_keyword(client, keyword, csv_sink)
+            print(f"📁 CSV saved for {keyword}: {csv_sink.path} ({csv_sink.rows} rows)")
             if not jobs:
                 continue
 
@@ -203,37 +191,35 @@ async def main():
                 existing_ids = set(str(row[0].value) for row in ws.iter_rows(min_row=2))
             else:
                 ws = wb.create_sheet(title=sheet_name)
-                ws.append(["Job ID", "Title", "Company", "Location", "Date Posted",
-                           "Keyword", "Job Link", "Mobile Link"])
+                ws.append(["Job ID"] + COLUMNS)
                 existing_ids = set()
 
             new_count = 0
             for job in jobs:
-                if job["Job ID"] in existing_ids:
+                row = job_row(job)
+                if row[0] in existing_ids:
                     continue
-                ws.append([job["Job ID"], job["Title"], job["Company"], job["Location"],
-                           job["Date Posted"], job["Keyword"], job["Job Link"], job["Mobile Link"]])
-                existing_ids.add(job["Job ID"])
+                ws.append(row)
+                existing_ids.add(row[0])
                 new_count += 1
 
             print(f"📝 {new_count} new jobs added to Excel sheet '{sheet_name}'.")
 
-            # ----- Save daily CSV per keyword -----
-            save_daily_csv(keyword, jobs)
-
             # ----- Console output -----
             print("\n========================")
             print(f"📢 RESULTS FOR {keyword}")
             print("========================\n")
             for job in jobs:
-                print("🧾 Title   :", job["Title"])
-                print("🏢 Company :", job["Company"])
-                print("📍 Location:", job["Location"])
-                print("📅 Posted  :", job["Date Posted"])
-                print("🔑 Keyword :", job["Keyword"])
-                print("🔗 Link    :", job["Mobile Link"])
+                print("🧾 Title   :", job.title)
+                print("🏢 Company :", job.company)
+                print("📍 Location:", job.location)
+                print("📅 Posted  :", job.date_posted)
+                print("🔑 Keyword :", job.keyword_label)
+                print("🔗 Link    :", job.mobile_link)
                 print("-" * 80)
 
+        print_connection_stats(client)
+
     # Save Excel workbook
     wb.save(excel_file)
     print(f"\n🎉 Excel saved: {excel_file}")
@@ -4,25 +4,22 @@
 # =============================================
 
 import asyncio
-import httpx
-from bs4 import BeautifulSoup
-import re
-import random
-import os
-from datetime import datetime, timedelta
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font
+import time
+from datetime import datetime
+import document_export
+import excel_export
+import parquet_snapshot
 from db_client import DBClient
-from docx import Document
-from docx.shared import Pt
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.pagesizes import LETTER
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.text.run import Run
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.colors import blue
+from export_queue import ExportQueue, shutdown_file_pool, submit_save
+from job_batch import RunDedupe, make_page_filter
+from linkedin_search import DEFAULT_TIME_WINDOW, iter_search_pages, shutdown_parse_pool
+from query_planner import MAX_PAGES, Query, describe, run_plan
+from rate_limiter import limiter_summary
+from response_cache import get_response_cache
+from crawl_state import get_crawl_state
+from seen_index import get_seen_index
+from repost_detector import get_repost_detector
+from http_client import create_client, print_connection_stats
 
 # ---------------------------------------------
 # CONFIG
@@ -31,347 +28,191 @@ KEYWORDS = ["Backend Developer", "SAP SD Consultant"]
 LOCATION = "United States"
 MAX_RETRY = 3
 SOURCE_PORTAL = "LinkedIn"
-
-# ---------------------------------------------
-# DATE FILTER (Last 7 days)
-# ---------------------------------------------
-def posted_within_last_week(date_str):
-    try:
-        post_date = datetime.fromisoformat(date_str.replace("Z", ""))
-        return post_date >= datetime.now() - timedelta(days=7)
-    except:
-        return False
-
-# ---------------------------------------------
-# CLEAN JOB ID → Mobile Link
-# ---------------------------------------------
-def get_mobile_link(job_link):
-    match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-    return f"https://www.linkedin.com/jobs/view/{match.group(1)}" if match else job_link
-
-# ---------------------------------------------
-# LOAD PREVIOUS DAY JOB IDS FOR DEDUPLICATION
-# ---------------------------------------------
-def load_previous_ids(keyword):
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-    filename = f"{keyword.replace(' ', '')}/{keyword.replace(' ', '')}_{yesterday}.xlsx"
-    if not os.path.exists(filename):
-        return set()
-
-    previous_ids = set()
-    try:
-        wb = load_workbook(filename)
-        ws = wb.active
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            job_link = row[5]  # Job Link column
-            m = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-            if m:
-                previous_ids.add(m.group(1))
-    except:
-        pass
-    return previous_ids
+KEYWORD_CONCURRENCY = 4     # keywords scraped at the same time (1 = serial)
+PAGE_PREFETCH = 3           # page requests kept in flight per keyword
+INCREMENTAL = True          # stop paging once a whole page is behind the keyword's watermark
 
 # ---------------------------------------------
 # SCRAPE PER KEYWORD
 # ---------------------------------------------
-async def fetch_jobs_for_keyword(client, keyword):
-    url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-    }
-
+async def fetch_jobs_for_keyword(client, keyword, run_dedupe=None):
     job_postings = []
-    seen_ids_today = set()
-    seen_ids_yesterday = load_previous_ids(keyword)
+    seen_ids_before = get_seen_index().load(keyword)
+    crawl_state = get_crawl_state()
 
     print(f"\n🚀 Starting scrape for keyword: {keyword}")
-    print(f"📌 Loaded {len(seen_ids_yesterday)} previous job IDs (for dedupe)")
-
-    page = 0
-    retry = 0
-
-    while True:
-        params = {
-            "keywords": keyword,
-            "location": LOCATION,
-            "sortBy": "R",          # Most recent
-            "f_TPR": "r86400",     # Last 7 days
-            "start": page * 25
-        }
-
-        print(f"🔄 Fetching page {page}...")
-
+    print(f"📌 Loaded {len(seen_ids_before)} previous job IDs (for dedupe)")
+
+    watermark = crawl_state.get(keyword) if INCREMENTAL else None
+    page_filter = make_page_filter(keyword, seen_ids_before, watermark, run_dedupe)
+    aborted = False
+
+    async def crawl_query(query):
+        """Crawl one (sub-)query into job_postings. Returns True if it looks saturated."""
+        nonlocal aborted
+        pages = iter_search_pages(client, keyword, query.location,
+                                  prefetch=PAGE_PREFETCH, max_retry=MAX_RETRY,
+                                  time_window=query.time_window)
+        query_ids = page_filter.query_ids()
         try:
-            resp = await client.get(url, headers=headers, params=params)
-
-            if resp.status_code == 429:
-                wait_time = random.randint(45, 90)
-                print(f"🚫 Rate limited (429). Sleeping {wait_time} sec...")
-                await asyncio.sleep(wait_time)
-                continue
-
-            if resp.status_code != 200:
-                print(f"❌ HTTP {resp.status_code} on page {page}")
-                retry += 1
-                if retry > MAX_RETRY:
-                    print("❌ Too many failures. Stopping scraper.")
-                    break
-                await asyncio.sleep(5)
-                continue
-
-            retry = 0
-            soup = BeautifulSoup(resp.content, "lxml")
-            job_cards = soup.select("li")
-
-            if not job_cards:
-                print(f"ℹ️ No more jobs found for: {keyword}")
-                break
-
-            page += 1
-
-            for job in job_cards:
-                try:
-                    title_tag = job.find("h3")
-                    company_tag = job.find("h4")
-                    location_tag = job.find("span", class_="job-search-card__location")
-                    time_tag = job.find("time")
-                    link_tag = job.find("a", href=True)
-
-                    if not all([title_tag, company_tag, location_tag, time_tag, link_tag]):
-                        continue
-
-                    job_link = link_tag["href"]
-                    mobile_link = get_mobile_link(job_link)
-
-                    job_id_match = re.search(r"/jobs/view/.*?-(\d+)", job_link)
-                    if not job_id_match:
-                        continue
-                    job_id = job_id_match.group(1)
-
-                    if job_id in seen_ids_today or job_id in seen_ids_yesterday:
-                        continue
-
-                    seen_ids_today.add(job_id)
-
-                    title = title_tag.text.strip()
-                    company = company_tag.text.strip()
-                    location = location_tag.text.strip()
-                    date_posted = time_tag.get("datetime", "")
-
-                    if not posted_within_last_week(date_posted):
-                        continue
-
-                    job_postings.append({
-                        "Title": title,
-                        "Company": company,
-                        "Location": location,
-                        "Date Posted": date_posted,
-                        "Keyword": keyword,
-                        "Job Link": job_link,
-                        "Mobile Link": mobile_link
-                    })
-
-                except Exception as e:
-                    print(f"⚠️ Parse Error: {e}")
-                    continue
-
-            await asyncio.sleep(random.uniform(1.5, 3.5))
+            async for page, job_cards in pages:
+                # Dedupe, date window and title filters over the whole page at once
+                kept, new_in_page, page_behind = page_filter.apply(job_cards, query_ids)
+                job_postings.extend(kept)
+
+                if page_behind:
+                    print(f"🛑 [{keyword}] Page {page} only has jobs known before today, stopping early")
+                    return False
+                # Guest search repeats pages / stops at a hard cap once a query is too broad
+                if new_in_page == 0:
+                    print(f"🔁 [{keyword}] Page {page} only repeats earlier cards ({describe(query)})")
+                    return True
+                if page + 1 >= MAX_PAGES:
+                    return True
+            return False
 
         except Exception as e:
             print(f"⚠️ Fatal Error: {e}")
-            break
+            aborted = True
+            return False
+        finally:
+            await pages.aclose()
+
+    queries_run = await run_plan(Query(keyword, LOCATION, DEFAULT_TIME_WINDOW), crawl_query)
+    if queries_run > 1:
+        print(f"🧭 [{keyword}] Covered with {queries_run} queries")
+
+    # Only a complete crawl may move the watermark, otherwise unseen older pages would be skipped.
+    # It is applied after the keyword's export succeeds (see get_crawl_state().commit).
+    if not aborted and INCREMENTAL:
+        crawl_state.propose(keyword, page_filter.newest)
 
     print(f"✅ Completed '{keyword}' — {len(job_postings)} jobs found.\n")
     return job_postings
 
 # ---------------------------------------------
-# SAVE EXCEL WITH HYPERLINKS
+# DAILY WORD + PDF PER KEYWORD
 # ---------------------------------------------
-def save_excel(file_path, sheet_name, jobs):
-    folder = os.path.dirname(file_path)
-    if folder:
-        os.makedirs(folder, exist_ok=True)
-
-    if os.path.exists(file_path):
-        wb = load_workbook(file_path)
-        if sheet_name in wb.sheetnames:
-            del wb[sheet_name]
-    else:
-        wb = Workbook()
+def keyword_documents(keyword, date_code):
+    # Built once per run; jobs from earlier runs today come from the journal
+    safe_keyword = keyword.replace(" ", "")
+    return document_export.KeywordDocuments(f"{safe_keyword}_{date_code}.docx",
+                                            f"{safe_keyword}_{date_code}.pdf")
 
-    ws = wb.create_sheet(title=sheet_name)
+# ---------------------------------------------
+# CONCURRENT KEYWORD SCRAPE
+# ---------------------------------------------
+async def scrape_keyword(client, db, keyword, semaphore, run_dedupe=None):
+    async with semaphore:
+        run_id = db.log_run_start(keyword, SOURCE_PORTAL)
+        started = time.perf_counter()
+        jobs = await fetch_jobs_for_keyword(client, keyword, run_dedupe)
+        return run_id, jobs, time.perf_counter() - started
+
+async def scrape_all_keywords(client, db, keywords, concurrency=KEYWORD_CONCURRENCY, on_keyword=None,
+                              run_dedupe=None):
+    """
+    Run fetch_jobs_for_keyword for several keywords at once over the shared
+    client. Returns {keyword: (run_id, jobs, elapsed)} in keyword order.
+    A job matched by several keywords is kept once, under the first of them
+    in `keywords` order and labelled with that keyword only, newest first
+    (run_dedupe.settle() adds the other keywords once all are done).
+    Each keyword's batch is final once it and every keyword before it are
+    done; `await on_keyword(keyword, run_id, jobs, elapsed)` gets it then,
+    while later keywords are still scraping.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    if run_dedupe is None:
+        run_dedupe = RunDedupe()
+    repost_detector = get_repost_detector()
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(scrape_keyword(client, db, keyword, semaphore, run_dedupe))
+             for keyword in keywords]
+    results = {}
+    for keyword, task in zip(keywords, tasks):
+        run_id, _, elapsed = await task
+        # Near-duplicate reposts (new job id, same role) are collapsed before anything is exported
+        owned = run_dedupe.owned_by(keyword, keywords)
+        jobs = repost_detector.process(owned)
+        if len(jobs) < len(owned):
+            # Collapsed reposts are never exported; mark them seen so later runs skip them
+            # instead of counting them as new on every page (which also blocks the early stop)
+            get_seen_index().record([job for job in owned if job.repost_of is not None])
+        results[keyword] = (run_id, jobs, elapsed)
+        if on_keyword is not None:
+            await on_keyword(keyword, run_id, jobs, elapsed)
+    wall = time.perf_counter() - started
+
+    # Summed task time, not a serial baseline: keywords share one host limiter,
+    # so each task's elapsed time includes waiting on the others
+    task_time = sum(elapsed for _, _, elapsed in results.values())
+    print(f"⏱️ Scraped {len(keywords)} keywords in {wall:.1f}s "
+          f"(summed keyword task time {task_time:.1f}s, concurrency {concurrency})")
+    for line in limiter_summary():
+        print(f"🚦 {line}")
+    print(f"💾 {get_response_cache().summary()}")
+    print(f"🔗 Run dedupe: {run_dedupe.summary()}")
+    print(f"♻️ {repost_detector.summary()}")
+    return results
 
-    headers = ["Title", "Company", "Location", "Date Posted", "Keyword", "Job Link", "Mobile Link"]
-    ws.append(headers)
+# ---------------------------------------------
+# EXPORT ONE KEYWORD (background worker)
+# ---------------------------------------------
+def export_keyword(db, released, file_saves, exported, date_code, keyword, run_id, jobs, elapsed):
+    """
+    Console listing, files, Parquet snapshot and DB insert for one finished
+    keyword. Runs on the export worker thread, in keyword order, so sheet
+    order and run-log rows stay stable; `db` is the worker's own connection.
+    The folder workbook and Word + PDF go to the file pool right away
+    (futures in `file_saves`); the daily sheet waits in `released` until
+    every keyword's label is known.
+    """
+    released.append((keyword, jobs))
 
+    print("\n========================")
+    print(f"📢 RESULTS FOR {keyword} ({elapsed:.1f}s)")
+    print("========================\n")
     for job in jobs:
-        row = [
-            job["Title"],
-            job["Company"],
-            job["Location"],
-            job["Date Posted"],
-            job["Keyword"],
-            job["Job Link"],
-            job["Mobile Link"]
-        ]
-        ws.append(row)
-
-        # Add hyperlink for Job Link column (6th column)
-        job_link_cell = ws.cell(row=ws.max_row, column=6, value=job["Job Link"])
-        job_link_cell.hyperlink = job["Job Link"]
-        job_link_cell.font = Font(color="0000FF", underline="single")
-
-        # Add hyperlink for Mobile Link column (7th column)
-        mobile_link_cell = ws.cell(row=ws.max_row, column=7, value=job["Mobile Link"])
-        mobile_link_cell.hyperlink = job["Mobile Link"]
-        mobile_link_cell.font = Font(color="0000FF", underline="single")
-
-    # Remove dummy default sheet if truly empty
-    remove_empty_sheet(wb)
-
-    wb.save(file_path)
-
-def remove_empty_sheet(wb):
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        # Consider sheet empty if it has no data in any cell
-        if sheet_name == "Sheet":
-            if all([cell.value is None for row in ws.iter_rows() for cell in row]):
-                wb.remove(ws)
-
-def add_hyperlink(paragraph, text, url):
+        print("🧾 Title   :", job.title)
+        print("🏢 Company :", job.company)
+        print("📍 Location:", job.location)
+        print("📅 Posted  :", job.date_posted)
+        print("🔑 Keyword :", job.keyword_label)
+        print("🔗 Link    :", job.mobile_link)
+        if job.repost_of:
+            print("♻️ Repost of:", job.repost_of)
+        print("-" * 80)
+
+    folder_file = f"{keyword.replace(' ', '')}/LinkedIn_{keyword.replace(' ', '')}_Jobs_{date_code}.xlsx"
+    for builder in (excel_export.WorkbookBuilder(folder_file).add_sheet(keyword, jobs),
+                    keyword_documents(keyword, date_code).add_jobs(jobs)):
+        file_saves.append((keyword, builder, submit_save(builder)))
+    try:
+        # Machine-readable copy for downstream readers (send_whatsapp etc.)
+        parquet_snapshot.write_snapshot(keyword, jobs)
+
+        # ---- DATABASE INSERT (one COPY + INSERT ... SELECT per keyword) ----
+        inserted = db.ingest_master(jobs, SOURCE_PORTAL)
+    except Exception:
+        # ingest_master has rolled back; close the run log so the run isn't left open
+        db.log_run_end(run_id, 0)
+        raise
+
+    db.log_run_end(run_id, inserted)
+    exported.append((keyword, jobs))
+    print(f"🎉 {inserted} Jobs Inserted and Run Completed Successfully for {keyword}\n")
+    db.cleanup_history()
+
+def relabel_keywords(db, run_dedupe, released):
     """
-    Create a clickable hyperlink in a python-docx paragraph.
+    Last export task, once every keyword has been scraped: give released
+    jobs every keyword that matched them and rewrite job_master's Keyword
+    column for the ones more than one keyword matched.
     """
-    part = paragraph.part
-    r_id = part.relate_to(
-        url,
-        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
-        is_external=True
-    )
-
-    hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
-
-    new_run = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-
-    u = OxmlElement("w:u")
-    u.set(qn("w:val"), "single")
-    rPr.append(u)
-
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0000FF")  # blue
-    rPr.append(color)
-
-    new_run.append(rPr)
-
-    t = OxmlElement("w:t")
-    t.text = text
-
-    new_run.append(t)
-    hyperlink.append(new_run)
-
-    paragraph._p.append(hyperlink)
-    return hyperlink
-
-
-def append_to_keyword_documents(keyword, job):
-    from docx import Document
-
-    date_code = datetime.now().strftime("%Y%m%d")
-    safe_keyword = keyword.replace(" ", "")
-    docx_file = f"{safe_keyword}_{date_code}.docx"
-    pdf_file  = f"{safe_keyword}_{date_code}.pdf"
-
-    # Load or create doc
-    if os.path.exists(docx_file):
-        doc = Document(docx_file)
-    else:
-        doc = Document()
-
-    # Title
-    p = doc.add_paragraph()
-    p.add_run("🧾 Title: ").bold = True
-    p.add_run(job["Title"])
-
-    p = doc.add_paragraph()
-    p.add_run("🏢 Company: ").bold = True
-    p.add_run(job["Company"])
-
-    p = doc.add_paragraph()
-    p.add_run("📍 Location: ").bold = True
-    p.add_run(job["Location"])
-
-    p = doc.add_paragraph()
-    p.add_run("📅 Posted: ").bold = True
-    p.add_run(job["Date Posted"])
-
-    p = doc.add_paragraph()
-    p.add_run("🔗 Link: ").bold = True
-    add_hyperlink(p, job["Mobile Link"], job["Mobile Link"])
-
-    p = doc.add_paragraph()
-    p.add_run("🔗 Web Link: ").bold = True
-    add_hyperlink(p, job["Job Link"], job["Job Link"])
-
-    doc.add_paragraph("-" * 80)
-    doc.save(docx_file)
-
-    # ----- PDF FROM DOCX -----
-    convert_docx_to_pdf(docx_file, pdf_file)
-
-def convert_docx_to_pdf(docx_file, pdf_file):
-    from docx import Document
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.pagesizes import LETTER
-    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-    from reportlab.lib.colors import blue
-
-    doc = Document(docx_file)
-
-    # -----------------------------
-    # ✅ FIX 3 — Add hyperlink style
-    # -----------------------------
-    styles = getSampleStyleSheet()
-    hyperlink_style = ParagraphStyle(
-        'Hyperlink',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=blue,
-        underline=True,
-        leading=14
-    )
-    normal_style = ParagraphStyle("Normal", fontSize=11, leading=14)
-    # -----------------------------
-
-    pdf = SimpleDocTemplate(pdf_file, pagesize=LETTER)
-    story = []
-
-    for para in doc.paragraphs:
-        text = para.text
-
-        # Detect hyperlinks
-        if text.startswith("🔗 Web Link: "):
-            url = text.replace("🔗 Web Link: ", "").strip()
-            text = f'🔗 Web Link: <a href="{url}">{url}</a>'
-            style_to_use = hyperlink_style
-
-        elif text.startswith("🔗 Link: "):
-            url = text.replace("🔗 Link: ", "").strip()
-            text = f'🔗 Link: <a href="{url}">{url}</a>'
-            style_to_use = hyperlink_style
-
-        else:
-            style_to_use = normal_style
-
-        story.append(Paragraph(text, style_to_use))
-        story.append(Spacer(1, 12))
-
-    pdf.build(story)
-
-
+    jobs = [job for _, keyword_jobs in released for job in run_dedupe.settle(keyword_jobs)]
+    shared = [job for job in jobs if len(job.keywords) > 1]
+    if shared:
+        print(f"🏷️ {db.relabel_master(shared, SOURCE_PORTAL)} job_master rows relabelled with every matched keyword")
 
 # ---------------------------------------------
 # MAIN
@@ -389,52 +230,66 @@ async def main():
     print("🧹 Clearing job_master table for today's run...")
     db.clear_master()
 
-    async with httpx.AsyncClient(timeout=45.0) as client:
-
-        for keyword in KEYWORDS:
-            run_id = db.log_run_start(keyword, SOURCE_PORTAL)
-            jobs = await fetch_jobs_for_keyword(client, keyword)
-
-            save_excel(main_excel, keyword, jobs)
-            folder_file = f"{keyword.replace(' ', '')}/LinkedIn_{keyword.replace(' ', '')}_Jobs_{date_code}.xlsx"
-            save_excel(folder_file, keyword, jobs)
-
-            print("\n========================")
-            print(f"📢 RESULTS FOR {keyword}")
-            print("========================\n")
-            for job in jobs:
-                print("🧾 Title   :", job["Title"])
-                print("🏢 Company :", job["Company"])
-                print("📍 Location:", job["Location"])
-                print("📅 Posted  :", job["Date Posted"])
-                print("🔑 Keyword :", job["Keyword"])
-                print("🔗 Link    :", job["Mobile Link"])
-                print("-" * 80)
-                doc_text = (
-                    f"🧾 Title   : {job['Title']}\n"
-                    f"🏢 Company : {job['Company']}\n"
-                    f"📍 Location: {job['Location']}\n"
-                    f"📅 Posted  : {job['Date Posted']}\n"
-                    f"🔑 Keyword : {job['Keyword']}\n"
-                    f"🔗 Link    : {job['Mobile Link']}\n"
-                    f"{'-' * 80}\n"
-                )
-
-                append_to_keyword_documents(job["Keyword"], job)
+    # Finished keywords are exported in the background while the rest are still scraping
+    export_db = DBClient()
+    daily_workbook = excel_export.WorkbookBuilder(main_excel)
+    released, file_saves, exported = [], [], []
+    export_queue = ExportQueue()
+    run_dedupe = RunDedupe()
 
-            print(f"\n📁 Saved to main Excel: {main_excel}")
-            print(f"📁 Saved to folder Excel: {folder_file}")
-            print("🎉 Scraping Completed Successfully!\n")
+    async def queue_export(keyword, run_id, jobs, elapsed):
+        await export_queue.submit(export_keyword, export_db, released, file_saves, exported, date_code,
+                                  keyword, run_id, jobs, elapsed)
 
-
-            # ---- DATABASE INSERT ----
-            for job in jobs:
-                job_id = db.upsert_master(job, SOURCE_PORTAL)
-
-            db.log_run_end(run_id, len(jobs))
-            print(f"🎉 {len(jobs)} Jobs Inserted and Run Completed Successfully for {keyword}\n")
-            db.cleanup_history()
-    db.close()
+    try:
+        async with create_client() as client:
+            await scrape_all_keywords(client, db, KEYWORDS, on_keyword=queue_export, run_dedupe=run_dedupe)
+            # Labels are final now; queued behind the exports so nothing is still reading the jobs
+            await export_queue.submit(relabel_keywords, export_db, run_dedupe, released)
+            print_connection_stats(client)
+    finally:
+        export_queue.drain()
+        shutdown_parse_pool()
+        db.close()
+        export_db.close()
+    print(f"🧵 {export_queue.summary()}")
+
+    # Keyword files were written in the pool while scraping; wait for any still running
+    started = time.perf_counter()
+    failed = set()
+    for keyword, builder, future in file_saves:
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"❌ Writing {builder.__class__.__name__} failed for {keyword}: {e}")
+            failed.add(keyword)
+            continue
+        if isinstance(builder, document_export.KeywordDocuments):
+            if result:
+                print(f"📝 Saved {result} new jobs to {builder.docx_file} + PDF")
+        elif result:
+            print(f"📁 Saved Excel: {result}")
+    shutdown_file_pool()
+    files_wait = time.perf_counter() - started
+
+    # The daily extract needs every keyword's sheet and final labels, so it is the one file written after scraping
+    started = time.perf_counter()
+    for keyword, jobs in released:
+        daily_workbook.add_sheet(keyword, jobs)
+    for file_path in excel_export.save_workbooks([daily_workbook]):
+        print(f"📁 Saved Excel: {file_path}")
+    excel_time = time.perf_counter() - started
+    print(f"📤 Export: {daily_workbook.rows} jobs; after scraping waited {files_wait:.1f}s on keyword files, "
+          f"daily workbook {excel_time:.1f}s (background export {export_queue.busy:.1f}s)")
+
+    # Seen ids and watermarks are recorded here, on the thread that owns them,
+    # for keywords whose files and DB insert all succeeded
+    for keyword, jobs in exported:
+        if keyword in failed:
+            continue
+        get_seen_index().record(run_dedupe.settle(jobs))
+        get_crawl_state().commit(keyword)
+    print("🎉 Scraping Completed Successfully!\n")
 
 # ---------------------------------------------
 # RUN
@@ -0,0 +1,113 @@
+# parquet_snapshot.py
+
+import os
+from datetime import date
+from urllib.parse import quote
+
+import export_cache
+from job_posting import JobPosting
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+SNAPSHOT_DIR = "snapshots"      # <dir>/date=YYYY-MM-DD/keyword=<kw>/jobs.parquet
+COMPRESSION = "zstd"
+TEMPLATE_VERSION = 1            # bump with SCHEMA
+
+if PARQUET_AVAILABLE:
+    SCHEMA = pa.schema([
+        ("job_id", pa.int64()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("location", pa.string()),
+        ("date_posted", pa.string()),
+        ("keywords", pa.list_(pa.string())),
+        ("job_link", pa.string()),
+        ("repost_of", pa.int64()),
+    ])
+    PARTITIONING = ds.partitioning(pa.schema([("date", pa.string()), ("keyword", pa.string())]),
+                                   flavor="hive")
+
+
+# ---------------------------------------------
+# WRITE
+# ---------------------------------------------
+def partition_path(keyword, day=None, directory=SNAPSHOT_DIR):
+    day = (day or date.today()).isoformat()
+    # Hive partition values are URI-encoded, so keywords with spaces round-trip
+    return os.path.join(directory, f"date={day}", f"keyword={quote(keyword, safe='')}", "jobs.parquet")
+
+
+def write_snapshot(keyword, jobs, day=None, directory=SNAPSHOT_DIR):
+    """
+    Write one keyword's jobs for the day as a compressed Parquet file,
+    replacing that partition if the day is re-run (unless it already holds
+    exactly these jobs). Returns the path, or None without pyarrow.
+    """
+    if not PARQUET_AVAILABLE:
+        return None
+    columns = {
+        "job_id": [job.job_id for job in jobs],
+        "title": [job.title for job in jobs],
+        "company": [job.company for job in jobs],
+        "location": [job.location for job in jobs],
+        "date_posted": [job.date_posted for job in jobs],
+        "keywords": [job.keywords for job in jobs],
+        "job_link": [job.job_link for job in jobs],
+        "repost_of": [job.repost_of for job in jobs],
+    }
+    path = partition_path(keyword, day, directory)
+    digest = export_cache.content_digest(TEMPLATE_VERSION, columns)
+    if export_cache.is_current(path, digest):
+        return path
+    table = pa.table(columns, schema=SCHEMA)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed, so dataset discovery ignores a half-written file
+    tmp_path = os.path.join(os.path.dirname(path), ".jobs.parquet.tmp")
+    pq.write_table(table, tmp_path, compression=COMPRESSION)
+    os.replace(tmp_path, path)
+    export_cache.mark(path, digest)
+    return path
+
+
+# ---------------------------------------------
+# READ
+# ---------------------------------------------
+def read_snapshot(day=None, keywords=None, columns=None, directory=SNAPSHOT_DIR):
+    """
+    Arrow table of the day's jobs. Only the requested `columns` are read,
+    and the date / keyword filters prune whole partitions before any file
+    is opened. Returns None when there is no snapshot (or no pyarrow).
+    """
+    if not PARQUET_AVAILABLE or not os.path.isdir(directory):
+        return None
+    dataset = ds.dataset(directory, format="parquet", partitioning=PARTITIONING)
+    predicate = ds.field("date") == (day or date.today()).isoformat()
+    if keywords:
+        predicate = predicate & ds.field("keyword").isin(list(keywords))
+    table = dataset.to_table(columns=columns, filter=predicate)
+    return table if table.num_rows else None
+
+
+def load_jobs(day=None, keywords=None, directory=SNAPSHOT_DIR):
+    """The day's snapshot as JobPostings (None when there is no snapshot)."""
+    columns = ["job_id", "title", "company", "location", "date_posted", "keywords", "job_link"]
+    table = read_snapshot(day, keywords, columns, directory)
+    if table is None:
+        return None
+    jobs = []
+    for row in table.to_pylist():
+        job = JobPosting(row["job_id"], row["title"], row["company"], row["location"],
+                         row["date_posted"], row["keywords"][0], row["job_link"])
+        job.keywords = row["keywords"]
+        jobs.append(job)
+    return jobs
@@ -0,0 +1,79 @@
+# query_planner.py
+
+import asyncio
+from collections import namedtuple
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+MAX_PAGES = 40              # guest search stops returning new cards after ~1000 results
+SHARD_CONCURRENCY = 4       # sub-queries of one keyword crawled at the same time
+MAX_SPLIT_DEPTH = 3
+
+US_STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut",
+    "Delaware", "District of Columbia", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois",
+    "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts",
+    "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada",
+    "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota",
+    "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina",
+    "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington",
+    "West Virginia", "Wisconsin", "Wyoming",
+]
+
+# Locations that can be partitioned into narrower ones
+LOCATION_SPLITS = {
+    "United States": [f"{state}, United States" for state in US_STATES],
+}
+
+# No time splits: f_TPR windows are nested ("last N seconds") and results are
+# sorted most recent first, so a narrower window's first ~1000 results are a
+# subset of the wider window's and never reach the older end of it.
+
+Query = namedtuple("Query", ["keyword", "location", "time_window"])
+
+
+def describe(query):
+    return f"{query.location} / {query.time_window}"
+
+
+# ---------------------------------------------
+# SPLITTING
+# ---------------------------------------------
+def split_query(query):
+    """Narrower sub-queries for a saturated query: disjoint locations."""
+    if query.location in LOCATION_SPLITS:
+        return [query._replace(location=loc) for loc in LOCATION_SPLITS[query.location]]
+    return []
+
+
+# ---------------------------------------------
+# PLAN + RUN
+# ---------------------------------------------
+async def run_plan(root, crawl_query, concurrency=SHARD_CONCURRENCY, max_depth=MAX_SPLIT_DEPTH):
+    """
+    Crawl `root` with `crawl_query(query) -> saturated`. Saturated queries are
+    split recursively and their shards crawled concurrently (at most
+    `concurrency` at a time). The caller's crawl_query merges results, so
+    dedupe across shards happens there. Returns the number of queries run.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    queries_run = 0
+
+    async def run(query, depth):
+        nonlocal queries_run
+        async with semaphore:
+            queries_run += 1
+            saturated = await crawl_query(query)
+        if not saturated:
+            return
+
+        shards = split_query(query) if depth < max_depth else []
+        if not shards:
+            print(f"⚠️ [{query.keyword}] {describe(query)} is saturated and cannot be split further")
+            return
+        print(f"🪓 [{query.keyword}] {describe(query)} saturated, splitting into {len(shards)} sub-queries")
+        await asyncio.gather(*(run(shard, depth + 1) for shard in shards))
+
+    await run(root, 0)
+    return queries_run
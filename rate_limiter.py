@@ -0,0 +1,140 @@
+# rate_limiter.py
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+START_RATE = 0.5            # requests / second when a host is first seen
+MIN_RATE = 0.05
+MAX_RATE = 2.0
+BURST = 2                   # tokens the bucket can hold
+RATE_INCREASE = 0.05        # additive increase per healthy response
+RATE_DECREASE = 0.5         # multiplicative decrease on 429 / errors
+DEFAULT_429_WAIT = (45, 90) # seconds, used when 429 has no Retry-After
+FAILURE_THRESHOLD = 5       # consecutive failures before the circuit opens
+CIRCUIT_COOLDOWN = 120.0    # seconds the circuit stays open
+
+
+# ---------------------------------------------
+# RETRY-AFTER PARSING
+# ---------------------------------------------
+def parse_retry_after(value):
+    """
+    Retry-After is either a number of seconds or an HTTP date.
+    Returns seconds to wait, or None if missing / unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------
+# TOKEN BUCKET + AIMD + CIRCUIT BREAKER
+# ---------------------------------------------
+class AdaptiveRateLimiter:
+    def __init__(self, host, rate=START_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE, burst=BURST,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN):
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.circuit_open_until = 0.0
+        self.lock = asyncio.Lock()
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """
+        Wait for a request slot. While the host's circuit is open the caller
+        waits out the cooldown (holding the lock, so everyone else queues
+        behind it); the first request afterwards is the half-open probe, and
+        the backed-off rate spaces out the ones after it.
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.circuit_open_until:
+                    print(f"⏳ Circuit open for {self.host}, waiting {self.circuit_open_until - now:.0f}s "
+                          f"before a probe request")
+                    await asyncio.sleep(self.circuit_open_until - now)
+                    continue
+
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+                wait = max(wait, (1 - self.tokens) / self.rate)
+                await asyncio.sleep(wait)
+
+    def on_success(self):
+        self.failures = 0
+        self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def on_rate_limited(self, retry_after=None):
+        self.rate_limited += 1
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            wait = random.randint(*DEFAULT_429_WAIT)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + wait)
+        self._backoff()
+        return wait
+
+    def on_failure(self):
+        self.errors += 1
+        self._backoff()
+
+    def _backoff(self):
+        self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+        self.tokens = min(self.tokens, 0.0)
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.circuit_open_until = time.monotonic() + self.cooldown
+            # Half-open afterwards: one more failure re-opens it immediately
+            self.failures = self.failure_threshold - 1
+            print(f"⛔ Circuit opened for {self.host} for {self.cooldown:.0f}s")
+
+    def summary(self):
+        return (f"{self.host}: {self.requests} requests, {self.rate_limited}x 429, "
+                f"{self.errors} errors, rate now {self.rate:.2f} req/s")
+
+
+# ---------------------------------------------
+# SHARED LIMITERS (one per host)
+# ---------------------------------------------
+_limiters = {}
+
+def get_limiter(host):
+    if host not in _limiters:
+        _limiters[host] = AdaptiveRateLimiter(host)
+    return _limiters[host]
+
+def limiter_summary():
+    return [limiter.summary() for limiter in _limiters.values()]
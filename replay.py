@@ -0,0 +1,98 @@
+# replay.py
+
+import asyncio
+import json
+import random
+import zipfile
+
+import httpx
+
+# Headers that describe the wire encoding; bodies are archived decoded
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def request_key(request):
+    return f"{request.method} {request.url}"
+
+
+def _clean_headers(headers):
+    return [(k, v) for k, v in headers.items() if k.lower() not in _WIRE_HEADERS]
+
+
+# ---------------------------------------------
+# RECORD
+# ---------------------------------------------
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a real transport and keeps every response (status, headers, body).
+    The archive is written when the client closes: a zip with index.json plus
+    one deflated body per distinct request.
+    """
+    def __init__(self, archive_path, transport=None):
+        self.archive_path = archive_path
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.recorded = {}
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()   # decoded according to Content-Encoding
+        await response.aclose()
+
+        headers = _clean_headers(response.headers)
+        self.recorded[request_key(request)] = (response.status_code, headers, body)
+        return httpx.Response(response.status_code, headers=headers, content=body,
+                              request=request, extensions=response.extensions)
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.save()
+
+    def save(self):
+        index = {}
+        with zipfile.ZipFile(self.archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for n, (key, (status, headers, body)) in enumerate(self.recorded.items()):
+                name = f"bodies/{n:06d}"
+                zf.writestr(name, body)
+                index[key] = {"status": status, "headers": headers, "body": name}
+            zf.writestr("index.json", json.dumps(index))
+        print(f"📼 Recorded {len(index)} responses to {self.archive_path}")
+
+
+# ---------------------------------------------
+# REPLAY
+# ---------------------------------------------
+def load_archive(archive_path):
+    """Returns {request_key: (status, headers, body)}."""
+    responses = {}
+    with zipfile.ZipFile(archive_path) as zf:
+        index = json.loads(zf.read("index.json"))
+        for key, entry in index.items():
+            responses[key] = (entry["status"], entry["headers"], zf.read(entry["body"]))
+    return responses
+
+
+class ReplayTransport(httpx.MockTransport):
+    """
+    Serves an archive back without any network. `latency` is a fixed delay in
+    seconds or a (low, high) range. Requests missing from the archive get an
+    empty 200 page, which the scraper treats as the end of results.
+    """
+    def __init__(self, archive_path, latency=0.0):
+        self.responses = load_archive(archive_path)
+        self.latency = latency
+        self.served = 0
+        self.missing = 0
+        super().__init__(self._handle)
+
+    async def _handle(self, request):
+        delay = random.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        entry = self.responses.get(request_key(request))
+        if entry is None:
+            self.missing += 1
+            return httpx.Response(200, content=b"")
+        self.served += 1
+        status, headers, body = entry
+        return httpx.Response(status, headers=headers, content=body)
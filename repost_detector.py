@@ -0,0 +1,248 @@
+# repost_detector.py
+
+import random
+import re
+import sqlite3
+import zlib
+from array import array
+from datetime import date
+from hashlib import blake2b
+
+from seen_index import SEEN_DB
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+REPOST_DB = SEEN_DB             # shares the seen-job index file
+REPOST_MODE = "collapse"        # "collapse" drops reposts, "flag" keeps them with job.repost_of set
+REPOST_RETENTION_DAYS = 30
+TITLE_SIMILARITY = 0.7          # word Jaccard of the titles, level/seniority words compared separately
+COMPANY_SIMILARITY = 0.6        # word Jaccard of the company names, legal suffixes stripped
+NUM_PERM = 128                  # MinHash signature length
+BANDS = 32                      # LSH bands (NUM_PERM / BANDS rows each)
+
+_PRIME = 4294967291             # largest prime below 2**32
+_rng = random.Random(20240101)  # fixed seed: signatures must stay comparable across days
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+if np is not None:
+    # a * h + b stays below 2**64 because a, b, h are all < 2**32
+    _A = np.array([a for a, _ in _PERMS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _PERMS], dtype=np.uint64)[:, None]
+
+_ABBREVIATIONS = {"sr": "senior", "jr": "junior", "dev": "developer", "eng": "engineer",
+                  "mgr": "manager", "sw": "software"}
+_NOISE = re.compile(r"\b(remote|hybrid|onsite|on site|contract|full time|part time|w2|c2c|urgent|hiring)\b")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_COMPANY_SUFFIXES = {"inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation",
+                     "co", "company", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "pvt", "srl"}
+_LEVELS = {"intern", "trainee", "entry", "graduate", "junior", "associate", "mid", "senior", "staff",
+           "principal", "lead", "head", "chief", "i", "ii", "iii", "iv", "v", "1", "2", "3", "4", "5"}
+
+
+# ---------------------------------------------
+# SIGNATURES
+# ---------------------------------------------
+def normalize(text):
+    """Lowercase, expand common abbreviations, drop work-mode noise words and punctuation."""
+    words = _NON_WORD.sub(" ", (text or "").lower()).split()
+    text = " ".join(_ABBREVIATIONS.get(w, w) for w in words)
+    return " ".join(_NOISE.sub(" ", text).split())
+
+
+def company_name(text):
+    """normalize() minus trailing legal suffixes, so "Acme" and "Acme Inc." compare equal."""
+    words = normalize(text).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def role_fields(job):
+    """Normalized (title, company, location) of a job, as stored next to its signature."""
+    return normalize(job.title), company_name(job.company), normalize(job.location)
+
+
+def shingles(job):
+    """
+    Word unigrams and bigrams of the title and company, tagged by field.
+    The location is left out: it is only a tie-breaker in same_role(), and
+    its words would otherwise outweigh a short title.
+    """
+    title, company, _ = role_fields(job)
+    features = set()
+    for field, text in (("t", title), ("c", company)):
+        words = text.split()
+        features.update(f"{field}:{w}" for w in words)
+        features.update(f"{field}:{a} {b}" for a, b in zip(words, words[1:]))
+    return features or {""}
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def same_role(fields, other_fields, title_threshold=TITLE_SIMILARITY, company_threshold=COMPANY_SIMILARITY):
+    """
+    Whether two role_fields() tuples describe the same opening. Titles and
+    companies must be similar, the level/seniority words ("Senior" vs
+    "Junior", "Engineer I" vs "Engineer III") must be identical, and one
+    location must contain the other ("Austin TX" vs "Austin TX United
+    States"); a missing location matches any.
+    """
+    title, company, location = (set(text.split()) for text in fields)
+    other_title, other_company, other_location = (set(text.split()) for text in other_fields)
+    if title & _LEVELS != other_title & _LEVELS:
+        return False
+    if _jaccard(title - _LEVELS, other_title - _LEVELS) < title_threshold:
+        return False
+    if _jaccard(company, other_company) < company_threshold:
+        return False
+    return not location or not other_location or location <= other_location or other_location <= location
+
+
+def minhash(job):
+    """NUM_PERM-long MinHash signature of the job's normalized title and company."""
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(job)]
+    if np is not None:
+        signature = ((_A * np.array(hashes, dtype=np.uint64) + _B) % _PRIME).min(axis=1)
+        return array("Q", signature.tobytes())
+    return array("Q", (min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS))
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    if np is not None:
+        return np.count_nonzero(np.frombuffer(sig_a, dtype=np.uint64) == np.frombuffer(sig_b, dtype=np.uint64)) / len(sig_a)
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def band_keys(signature, bands=BANDS):
+    rows = len(signature) // bands
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows].tobytes()
+        yield band, int.from_bytes(blake2b(chunk, digest_size=8).digest(), "big", signed=True)
+
+
+# ---------------------------------------------
+# PERSISTENT LSH INDEX
+# ---------------------------------------------
+class RepostDetector:
+    """
+    MinHash/LSH index of recent postings, persisted in SQLite so reposts are
+    caught across days. Each title/company signature is split into BANDS
+    buckets; a new posting is only compared with postings sharing at least
+    one bucket (one indexed lookup per band, in a single query), and a
+    candidate is confirmed with same_role() on the stored role fields.
+    """
+    def __init__(self, path=REPOST_DB, mode=REPOST_MODE, title_threshold=TITLE_SIMILARITY,
+                 company_threshold=COMPANY_SIMILARITY, retention_days=REPOST_RETENTION_DAYS):
+        self.mode = mode
+        self.title_threshold = title_threshold
+        self.company_threshold = company_threshold
+        self.retention_days = retention_days
+        self.checked = 0
+        self.reposts = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS repost_signatures (
+                job_id     INTEGER PRIMARY KEY,
+                first_seen INTEGER NOT NULL,
+                signature  BLOB    NOT NULL,
+                role       TEXT
+            );
+            CREATE TABLE IF NOT EXISTS repost_bands (
+                band   INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                job_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, job_id)
+            ) WITHOUT ROWID;
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(repost_signatures)")}
+        if "role" not in columns:
+            # Rows indexed before role fields never match again and age out with retention
+            self.conn.execute("ALTER TABLE repost_signatures ADD COLUMN role TEXT")
+        self.prune()
+
+    def find(self, job_id, signature, fields):
+        """Job id of the most similar indexed posting for the same role, or None."""
+        keys = list(band_keys(signature))
+        buckets = " UNION ".join(["SELECT job_id FROM repost_bands WHERE band = ? AND bucket = ?"] * len(keys))
+        rows = self.conn.execute(
+            f"SELECT job_id, signature, role FROM repost_signatures WHERE job_id IN ({buckets})",
+            [value for key in keys for value in key],
+        )
+
+        best, best_score = None, -1.0
+        for other, other_signature, other_role in rows:
+            if other == job_id or other_role is None:
+                continue
+            if not same_role(fields, other_role.split("|"), self.title_threshold, self.company_threshold):
+                continue
+            score = similarity(signature, array("Q", other_signature))
+            if score > best_score:
+                best, best_score = other, score
+        return best
+
+    def add(self, job_id, signature, fields):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO repost_signatures (job_id, first_seen, signature, role) VALUES (?, ?, ?, ?)",
+            (job_id, date.today().toordinal(), signature.tobytes(), "|".join(fields)))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO repost_bands (band, bucket, job_id) VALUES (?, ?, ?)",
+            ((band, bucket, job_id) for band, bucket in band_keys(signature)))
+
+    def process(self, jobs):
+        """
+        Check jobs against history (and each other). Originals are indexed;
+        every repost gets job.repost_of set and is dropped in "collapse" mode
+        or kept in "flag" mode. Returns the jobs to export.
+        """
+        kept = []
+        with self.conn:
+            for job in jobs:
+                self.checked += 1
+                signature, fields = minhash(job), role_fields(job)
+                original = self.find(job.job_id, signature, fields)
+                if original is None:
+                    self.add(job.job_id, signature, fields)
+                    kept.append(job)
+                    continue
+
+                self.reposts += 1
+                job.repost_of = original
+                print(f"♻️ [{job.keyword}] {job.title} @ {job.company} looks like a repost of job {original}")
+                if self.mode == "flag":
+                    kept.append(job)
+        return kept
+
+    def prune(self):
+        cutoff = date.today().toordinal() - self.retention_days
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM repost_bands WHERE job_id IN "
+                "(SELECT job_id FROM repost_signatures WHERE first_seen < ?)", (cutoff,))
+            self.conn.execute("DELETE FROM repost_signatures WHERE first_seen < ?", (cutoff,))
+
+    def summary(self):
+        action = "flagged" if self.mode == "flag" else "collapsed"
+        return f"repost check: {self.reposts}/{self.checked} jobs {action} as near-duplicates"
+
+    def close(self):
+        self.conn.close()
+
+
+# ---------------------------------------------
+# SHARED DETECTOR
+# ---------------------------------------------
+_detector = None
+
+def get_repost_detector():
+    global _detector
+    if _detector is None:
+        _detector = RepostDetector()
+    return _detector
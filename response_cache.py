@@ -0,0 +1,155 @@
+# response_cache.py
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+CACHE_DIR = ".http_cache"
+CACHE_TTL = 3600                    # seconds a cached page stays fresh (0 disables the cache)
+CACHE_MAX_BYTES = 200 * 1024 * 1024 # on-disk size before the oldest entries are evicted
+
+
+# ---------------------------------------------
+# ON-DISK RESPONSE CACHE
+# ---------------------------------------------
+class ResponseCache:
+    """
+    Content-addressed cache of successful GET bodies. The key is a SHA-256 of
+    the URL plus its sorted query params; bodies are stored gzip-compressed
+    under CACHE_DIR/<2 hex>/<hash>.gz and expire after `ttl` seconds.
+    """
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = None     # computed on first write
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    @staticmethod
+    def key(url, params):
+        raw = json.dumps([str(url), sorted((str(k), str(v)) for k, v in params.items())])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.gz")
+
+    def get(self, url, params):
+        if not self.enabled:
+            return None
+        path = self._path(self.key(url, params))
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                self.misses += 1
+                return None
+            with gzip.open(path, "rb") as f:
+                content = f.read()
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+
+    def put(self, url, params, content):
+        writer = self.writer(url, params)
+        if writer is not None:
+            writer.write(content)
+            writer.commit()
+
+    def writer(self, url, params):
+        """Streaming put: write() chunks, then commit() (or discard())."""
+        if not self.enabled:
+            return None
+        return CacheWriter(self, self._path(self.key(url, params)))
+
+    def _committed(self, path, old_size):
+        if self.total_bytes is None:
+            self.total_bytes = self._scan_size()
+        else:
+            self.total_bytes += os.path.getsize(path) - old_size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until under max_bytes."""
+        now = time.time()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if total <= self.max_bytes * 0.9 and now - mtime <= self.ttl:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.total_bytes = total
+        if removed:
+            print(f"🧹 Response cache: evicted {removed} entries ({total / 1024 / 1024:.1f} MB left)")
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups if lookups else 0.0
+        return f"response cache: {self.hits}/{lookups} pages served from disk ({ratio:.0%})"
+
+
+class CacheWriter:
+    def __init__(self, cache, path):
+        self.cache = cache
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.tmp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        self.file = gzip.open(self.tmp_path, "wb", compresslevel=3)
+
+    def write(self, chunk):
+        self.file.write(chunk)
+
+    def commit(self):
+        self.file.close()
+        old_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        os.replace(self.tmp_path, self.path)
+        self.cache._committed(self.path, old_size)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------
+# SHARED CACHE
+# ---------------------------------------------
+_cache = None
+
+def get_response_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,82 @@
+# seen_index.py
+
+import sqlite3
+from datetime import date
+
+# ---------------------------------------------
+# CONFIG
+# ---------------------------------------------
+SEEN_DB = "seen_jobs.sqlite3"
+SEEN_RETENTION_DAYS = 100   # same window as DBClient.cleanup_history
+
+
+# ---------------------------------------------
+# MULTI-DAY SEEN-JOB INDEX
+# ---------------------------------------------
+class SeenIndex:
+    """
+    Job ids already exported on earlier days, per keyword, kept for
+    `retention_days`. One SQLite table keyed by (keyword, job_id) with the
+    first day the job was exported as a day ordinal; WITHOUT ROWID keeps it
+    at roughly one B-tree entry per job, and expired rows are pruned on open.
+    Today's ids are left out of load(), so re-running a day reproduces it.
+    """
+    def __init__(self, path=SEEN_DB, retention_days=SEEN_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                keyword    TEXT    NOT NULL,
+                job_id     INTEGER NOT NULL,
+                first_seen INTEGER NOT NULL,
+                PRIMARY KEY (keyword, job_id)
+            ) WITHOUT ROWID
+        """)
+        self.prune()
+
+    @staticmethod
+    def _today():
+        return date.today().toordinal()
+
+    def load(self, keyword):
+        """Set of int job ids exported for `keyword` before today."""
+        today = self._today()
+        rows = self.conn.execute(
+            "SELECT job_id FROM seen_jobs WHERE keyword = ? AND first_seen BETWEEN ? AND ?",
+            (keyword, today - self.retention_days, today - 1),
+        )
+        return {job_id for (job_id,) in rows}
+
+    def record(self, jobs):
+        """Mark JobPostings as exported today under each keyword they matched."""
+        today = self._today()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (keyword, job_id, first_seen) VALUES (?, ?, ?)",
+                ((keyword, job.job_id, today) for job in jobs for keyword in job.keywords),
+            )
+
+    def prune(self):
+        with self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM seen_jobs WHERE first_seen < ?",
+                (self._today() - self.retention_days,),
+            ).rowcount
+        if removed:
+            print(f"🧹 Seen-job index: dropped {removed} ids older than {self.retention_days} days")
+
+    def close(self):
+        self.conn.close()
+
+
+# ---------------------------------------------
+# SHARED INDEX
+# ---------------------------------------------
+_index = None
+
+def get_seen_index():
+    global _index
+    if _index is None:
+        _index = SeenIndex()
+    return _index
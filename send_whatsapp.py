@@ -3,6 +3,9 @@ import random
 import requests
 from openpyxl import load_workbook
 from datetime import datetime
+from job_extractor import JOB_ID_RE
+from job_posting import JobPosting
+import parquet_snapshot
 
 # ====================================
 # WHATSAPP CLOUD API CONFIG
@@ -18,21 +21,31 @@ today_code = datetime.now().strftime("%Y%m%d")
 excel_file = f"Job_Extract_{today_code}.xlsx"
 
 def load_all_jobs(excel_path):
-    wb = load_workbook(excel_path)
+    # Today's Parquet snapshot is the canonical copy; the Excel file is the fallback
+    jobs = parquet_snapshot.load_jobs()
+    if jobs is not None:
+        return jobs
+
+    wb = load_workbook(excel_path, read_only=True)
     all_jobs = []
 
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
         for row in ws.iter_rows(min_row=2, values_only=True):
             title, company, location, date_posted, keyword, link, mobile = row
-            all_jobs.append({
-                "title": title or "",
-                "company": company or "",
-                "location": location or "",
-                "date": str(date_posted) if date_posted else "",
-                "keyword": keyword or "",
-                "link": mobile or ""
-            })
+            m = JOB_ID_RE.search(link or "")
+            if not m:
+                continue
+            all_jobs.append(JobPosting(
+                m.group(1),
+                title or "",
+                company or "",
+                location or "",
+                str(date_posted) if date_posted else "",
+                keyword or "",
+                link
+            ))
+    wb.close()
     return all_jobs
 
 # ====================================
@@ -64,10 +77,10 @@ def send_whatsapp_message(message):
 def create_message_from_jobs(jobs):
     text = "🔥 *Top Jobs for You* 🔥\n\n"
     for j in jobs:
-        text += f"📌 *{j['title']}*\n"
-        text += f"🏢 {j['company']}\n"
-        text += f"📍 {j['location']}\n"
-        text += f"🔗 {j['link']}\n"
+        text += f"📌 *{j.title}*\n"
+        text += f"🏢 {j.company}\n"
+        text += f"📍 {j.location}\n"
+        text += f"🔗 {j.mobile_link}\n"
         text += "--------------------\n"
     return text
 
@@ -76,12 +89,12 @@ def create_message_from_jobs(jobs):
 # ====================================
 def start_auto_sender(batch_size=2, interval_minutes=1):
     all_jobs = load_all_jobs(excel_file)
-    print(f"📥 Loaded {len(all_jobs)} jobs from Excel.")
+    print(f"📥 Loaded {len(all_jobs)} jobs for today.")
 
     sent_jobs = set()  # Track sent jobs
 
     while all_jobs:
-        available_jobs = [j for j in all_jobs if j['link'] not in sent_jobs]
+        available_jobs = [j for j in all_jobs if j.job_id not in sent_jobs]
         if not available_jobs:
             print("✅ All jobs have been sent. Exiting.")
             break
@@ -91,7 +104,7 @@ def start_auto_sender(batch_size=2, interval_minutes=1):
         send_whatsapp_message(message)
 
         for j in batch:
-            sent_jobs.add(j['link'])
+            sent_jobs.add(j.job_id)
 
         print(f"⏳ Waiting {interval_minutes} minutes before next batch...\n")
         time.sleep(interval_minutes * 60)